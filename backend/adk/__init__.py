@@ -5,7 +5,7 @@ This module provides Google ADK integration for the life path simulation app,
 including agent session management and communication handlers.
 """
 
-from .adk import AGENT_MAP, APP_NAME, active_sessions, agent_to_client_sse, create_one_time_session, generate_life_events_with_adk, generate_node_response, get_agent, get_available_agents, get_personal_info, minio_client, send_message_to_agent, set_database_connection, start_agent_session
+from .adk import AGENT_MAP, APP_NAME, active_sessions, aget_personal_info, agent_to_client_sse, check_interview_completeness, close_genai_client, close_session, create_one_time_session, generate_life_events_with_adk, generate_node_response, get_agent, get_available_agents, get_personal_info, invalidate_personal_info, invalidate_user_image, minio_client, send_message_to_agent, set_database_connection, start_agent_session
 from .interviewer import AGENT_INSTRUCTION as INTERVIEWER_INSTRUCTION
 from .interviewer import InterviewerAgent
 from .interviewer import agent as interviewer_agent
@@ -18,6 +18,8 @@ __all__ = [
     "start_agent_session",
     "agent_to_client_sse",
     "send_message_to_agent",
+    "check_interview_completeness",
+    "close_session",
     "active_sessions",
     "APP_NAME",
     # One-time session functions (no chat history)
@@ -25,9 +27,13 @@ __all__ = [
     "generate_node_response",
     "generate_life_events_with_adk",
     "get_personal_info",
+    "aget_personal_info",
+    "invalidate_personal_info",
     "set_database_connection",
     # MinIO client
     "minio_client",
+    "invalidate_user_image",
+    "close_genai_client",
     # Agent management
     "AGENT_MAP",
     "get_agent",
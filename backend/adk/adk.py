@@ -1,16 +1,30 @@
 import asyncio
-import base64
+import atexit
+import bisect
+import contextlib
+import functools
 import io
-import json
-import mimetypes
+import logging
+import logging.handlers
 import os
+import queue
 import random
+import string
+import sys
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
+import certifi
 import google.generativeai as genai
+import orjson
 import psycopg2
+import pybase64
+import urllib3
 from dotenv import load_dotenv
 from google import genai as google_genai
 from google.adk.agents import LiveRequestQueue
@@ -22,15 +36,94 @@ from minio import Minio
 from minio.error import S3Error
 from psycopg2.extras import RealDictCursor
 
+from .helpers import buffered, buffered_batches
 from .interviewer import agent as interviewer_agent
 from .node_maker import agent as node_maker_agent
 from .reviewer import reviewer_agent
 
-active_sessions: Dict[str, Tuple[LiveRequestQueue, int, bool]] = {}  # Now stores (queue, message_count, has_initial_message)
-initial_message_sent: Dict[str, bool] = {}  # Track if initial message was sent to each user
+
+class _TrackedLiveRequestQueue(LiveRequestQueue):
+    """LiveRequestQueue that counts the requests ADK has not taken yet, using only its public methods."""
+
+    def __init__(self):
+        super().__init__()
+        self.pending = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def _added(self) -> None:
+        self.pending += 1
+        self._drained.clear()
+
+    def send_content(self, content: types.Content):
+        self._added()
+        super().send_content(content)
+
+    def send_realtime(self, blob: types.Blob):
+        self._added()
+        super().send_realtime(blob)
+
+    async def get(self):
+        request = await super().get()
+        # Requests queued by close() were never counted
+        if self.pending:
+            self.pending -= 1
+        if not self.pending:
+            self._drained.set()
+        return request
+
+    async def wait_drained(self) -> None:
+        """Wait until ADK has taken every counted request."""
+        await self._drained.wait()
+
+
+@dataclass(slots=True)
+class SessionState:
+    """Per-user live interview session, updated in place as messages flow."""
+
+    queue: LiveRequestQueue
+    message_count: int = 0
+    has_initial_message: bool = False
+    last_touched: float = field(default_factory=time.monotonic)
+    # Client messages waiting for ADK as (is_audio, Blob or Content), drained by `forwarder`
+    outbox: deque = field(default_factory=deque)
+    # How many of the outbox entries are audio
+    outbox_audio: int = 0
+    outbox_ready: asyncio.Event = field(default_factory=asyncio.Event)
+    forwarder: Optional[asyncio.Task] = None
+
+
+# Bounded LRU of live sessions, least recently touched first
+ACTIVE_SESSIONS_MAX = int(os.getenv("ACTIVE_SESSIONS_MAX", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+
+active_sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+_session_sweeper: Optional[asyncio.Task] = None
+
+# One-shot (non-interview) agent runs share one runner per agent and are capped in flight
+_RUNNER_CACHE: Dict[str, InMemoryRunner] = {}
+_ONESHOT_SEM = asyncio.Semaphore(int(os.getenv("ADK_ONESHOT_CONCURRENCY", "8")))
+
+# How many live events the agent may produce ahead of the SSE consumer
+LIVE_EVENT_BUFFER = int(os.getenv("LIVE_EVENT_BUFFER", "32"))
+
+# The SSE stream buffers interview events deeper and flushes up to SSE_MAX_BATCH of them per write
+SSE_EVENT_BUFFER = int(os.getenv("SSE_EVENT_BUFFER", "256"))
+SSE_MAX_BATCH = int(os.getenv("SSE_MAX_BATCH", "32"))
 
 APP_NAME = "Stem-Connect ADK Integration"
 
+# Log records are formatted and written on a listener thread so the event loop never blocks on stdout
+logger = logging.getLogger("adk")
+logger.setLevel(os.getenv("ADK_LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Database connection will be imported from main.py to ensure consistency
 db = None
 
@@ -39,7 +132,7 @@ def set_database_connection(database_connection):
     """Set the database connection to use the same one as main.py"""
     global db
     db = database_connection
-    print(f"[ADK] Database connection set: {db is not None}")
+    logger.info("[ADK] Database connection set: %s", db is not None)
 
 
 # Initialize MinIO client
@@ -48,23 +141,100 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "admin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "password123")
 MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() == "true"
 
+# Sized for the parallel image tasks; Minio's default pool keeps only 10 connections per host
+MINIO_POOL_MAXSIZE = int(os.getenv("MINIO_POOL_MAXSIZE", "32"))
+
+_minio_http = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=MINIO_POOL_MAXSIZE,
+    block=False,
+    cert_reqs="CERT_REQUIRED",
+    ca_certs=os.getenv("SSL_CERT_FILE") or certifi.where(),
+    # Timeouts and retries as in Minio's own default pool; only the pool size differs
+    timeout=urllib3.Timeout(connect=300, read=300),
+    retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+)
+
 minio_client = Minio(
     MINIO_ENDPOINT,
     access_key=MINIO_ACCESS_KEY,
     secret_key=MINIO_SECRET_KEY,
     secure=MINIO_SECURE,
+    http_client=_minio_http,
 )
 
+USER_IMAGE_BUCKET = "user-images"
+NODE_IMAGE_BUCKET = "node-images"
+
+# Buckets already known to exist, so image generation skips the round-trips
+_BUCKETS_READY: set = set()
+# Serializes the first-use checks so a burst of parallel events makes one round-trip per bucket
+_BUCKET_LOCK = asyncio.Lock()
+
+# Per-user base image bytes (None when the user has no image), kept in LRU order
+USER_IMAGE_CACHE_MAX = int(os.getenv("USER_IMAGE_CACHE_MAX", "64"))
+_user_image_cache: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+_user_image_lock = threading.Lock()
+
+# Presigned URLs are reused until a day before they expire: (bucket, object) -> (url, reuse_until)
+SIGNED_URL_EXPIRY = timedelta(days=7)
+SIGNED_URL_CACHE_TTL = SIGNED_URL_EXPIRY - timedelta(days=1)
+SIGNED_URL_CACHE_MAX = int(os.getenv("SIGNED_URL_CACHE_MAX", "4096"))
+_signed_url_cache: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+_signed_url_lock = threading.Lock()
+
+# Personal info rows per user (None when the user has none), reused for a short TTL in LRU order
+PERSONAL_INFO_CACHE_TTL = float(os.getenv("PERSONAL_INFO_CACHE_TTL", "60"))
+PERSONAL_INFO_CACHE_MAX = int(os.getenv("PERSONAL_INFO_CACHE_MAX", "1024"))
+_personal_info_cache: "OrderedDict[str, Tuple[Optional[Dict[str, Any]], float]]" = OrderedDict()
+_personal_info_lock = threading.Lock()
+
 # Initialize Gemini for image generation
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-print(f"[IMAGE GEN] GEMINI_API_KEY loaded: {'Yes' if GEMINI_API_KEY else 'No'}")
+logger.info("[IMAGE GEN] GEMINI_API_KEY loaded: %s", "Yes" if GEMINI_API_KEY else "No")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
     image_model = genai.GenerativeModel("gemini-2.5-flash")
-    print(f"[IMAGE GEN] Gemini configured successfully")
+    logger.info("[IMAGE GEN] Gemini configured successfully")
+
+# One GenAI client for all image requests, so its HTTP connection pool and TLS sessions are reused
+_GENAI_CLIENT = google_genai.Client(api_key=GEMINI_API_KEY) if GEMINI_API_KEY else None
+
+
+async def close_genai_client() -> None:
+    """Release the shared GenAI client's async and sync connection pools; call from app shutdown."""
+    if _GENAI_CLIENT is None:
+        return
+    # Image traffic goes through the async pool; both close methods only exist on newer google-genai releases
+    if hasattr(_GENAI_CLIENT.aio, "aclose"):
+        await _GENAI_CLIENT.aio.aclose()
+    if hasattr(_GENAI_CLIENT, "close"):
+        _GENAI_CLIENT.close()
+
+
+# The image model only returns a handful of types; anything unexpected is stored as .png
+_MIME_EXT = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+
+# Characters in AI-generated event names that would break MinIO object keys
+_NAME_TRANS = str.maketrans({" ": "-", "/": "-", "\\": "-", ":": "-", "?": "-", "*": "-"})
+
+IMAGE_MODEL = "gemini-2.5-flash-image-preview"
+
+# Constant request config for Nano Banana; the SDK treats it as read-only input
+_IMAGE_GEN_CONFIG = types.GenerateContentConfig(response_modalities=["IMAGE", "TEXT"])
+
+# Caps in-flight Gemini image requests across all users to avoid 429 storms
+_GEMINI_SEM = asyncio.Semaphore(int(os.getenv("GEMINI_MAX_INFLIGHT", "6")))
+
+# Per-request cap on how many event images are generated at once
+IMAGE_CONCURRENCY = int(os.getenv("IMAGE_CONCURRENCY", "4"))
+
+# Opt-in: ask for all of a request's event images in one Gemini call (falls back to per-event calls).
+# Off by default because nothing verifies the model returns the images in event order.
+IMAGE_BATCH_GENERATION = os.getenv("IMAGE_BATCH_GENERATION", "false").lower() == "true"
 
 # Agent registry
 AGENT_MAP = {
@@ -74,6 +244,50 @@ AGENT_MAP = {
 }
 
 
+def _touch(user_id: str, state: SessionState) -> None:
+    """Stamp a session as used now and move it to the most recently used end of the LRU."""
+    state.last_touched = time.monotonic()
+    active_sessions.move_to_end(user_id)
+
+
+def _close_session_state(state: SessionState) -> None:
+    """Close a session's live queue and stop forwarding its buffered client messages."""
+    state.queue.close()
+    if state.forwarder is not None:
+        state.forwarder.cancel()
+
+
+def close_session(user_id: str) -> None:
+    """Close and forget a session."""
+    state = active_sessions.pop(user_id, None)
+    if state:
+        _close_session_state(state)
+
+
+async def _sweep_idle_sessions() -> None:
+    """Periodically evict sessions that have not been touched within SESSION_TTL_SECONDS."""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        cutoff = time.monotonic() - SESSION_TTL_SECONDS
+        # Entries are kept in LRU order, so stale sessions are always at the front
+        stale = []
+        for user_id, state in active_sessions.items():
+            if state.last_touched >= cutoff:
+                break
+            stale.append(user_id)
+        for user_id in stale:
+            close_session(user_id)
+        if stale:
+            logger.info("[SESSION] Evicted %d idle sessions", len(stale))
+
+
+def _ensure_session_sweeper() -> None:
+    """Start the idle-session sweeper on the running loop if it is not already running."""
+    global _session_sweeper
+    if _session_sweeper is None or _session_sweeper.done():
+        _session_sweeper = asyncio.get_running_loop().create_task(_sweep_idle_sessions())
+
+
 def get_agent(agent_type: str = "interviewer_agent"):
     """Get an agent by type from the agent registry."""
     if agent_type not in AGENT_MAP:
@@ -87,41 +301,141 @@ def get_available_agents() -> list:
     return list(AGENT_MAP.keys())
 
 
+_ONE_TIME_RUN_CONFIGS = {False: RunConfig(response_modalities=["TEXT"]), True: RunConfig(response_modalities=["AUDIO"])}
+
+
+def _get_runner(agent) -> InMemoryRunner:
+    """Return the shared InMemoryRunner for an agent, creating it on first use."""
+    runner = _RUNNER_CACHE.get(agent.name)
+    if runner is None:
+        runner = _RUNNER_CACHE.setdefault(agent.name, InMemoryRunner(app_name=APP_NAME, agent=agent))
+    return runner
+
+
+async def _release_session(runner: InMemoryRunner, session) -> None:
+    """Drop a finished session from a shared runner's in-memory store."""
+    await runner.session_service.delete_session(app_name=APP_NAME, user_id=session.user_id, session_id=session.id)
+
+
+async def _release_after(runner: InMemoryRunner, session, live_events: AsyncGenerator) -> AsyncGenerator:
+    """Yield from live_events, then release the session they belong to."""
+    try:
+        async for event in live_events:
+            yield event
+    finally:
+        await _release_session(runner, session)
+
+
 async def create_one_time_session(prompt: str, agent_type: str = "interviewer_agent", is_audio: bool = False) -> Tuple[AsyncGenerator, LiveRequestQueue]:
     """Creates a one-time session for generating nodes without chat history."""
     selected_agent = get_agent(agent_type)
     session_id = str(uuid.uuid4())
-    runner = InMemoryRunner(app_name=APP_NAME, agent=selected_agent)
+    runner = _get_runner(selected_agent)
     session = await runner.session_service.create_session(app_name=APP_NAME, user_id=session_id)
-    modality = "AUDIO" if is_audio else "TEXT"
-    run_config = RunConfig(response_modalities=[modality])
+    run_config = _ONE_TIME_RUN_CONFIGS[is_audio]
     live_request_queue = LiveRequestQueue()
     live_events = runner.run_live(session=session, live_request_queue=live_request_queue, run_config=run_config)
     initial_content = Content(role="user", parts=[Part.from_text(text=prompt)])
     live_request_queue.send_content(content=initial_content)
-    return live_events, live_request_queue
+    return buffered(_release_after(runner, session, live_events), buffer_size=LIVE_EVENT_BUFFER), live_request_queue
+
 
+# Transcript line prefixes for the usual chat roles; anything else is upper-cased on the fly
+_ROLE_PREFIX = {"user": "USER: ", "assistant": "ASSISTANT: ", "system": "SYSTEM: ", "model": "MODEL: "}
 
-async def check_interview_completeness(user_id: str, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
-    """Check if the interview has gathered enough information using the reviewer agent."""
-    conversation_str = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in conversation_history])
 
+@dataclass(slots=True)
+class _CompletenessCheck:
+    """A reviewer run waiting to start, shared by every caller that arrives before it does."""
+
+    conversation_history: List[Dict[str, str]]
+    result: asyncio.Future
+    on_complete: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+
+
+# Per user: the next queued check, and the task draining that user's checks one at a time
+_pending_checks: Dict[str, _CompletenessCheck] = {}
+_check_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def check_interview_completeness(
+    user_id: str,
+    conversation_history: List[Dict[str, str]],
+    on_complete: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Check if the interview has gathered enough information using the reviewer agent.
+    Calls that arrive while a check for the same user is running are coalesced into one follow-up run
+    over the most recent conversation history, which every one of those callers then receives.
+    `on_complete(user_id, personal_info_data)` runs once per reviewer run that finds the interview complete,
+    before any caller gets the result, so coalesced callers don't each persist the same data.
+    """
+    check = _pending_checks.get(user_id)
+    if check is not None:
+        # Clients send the whole conversation so far, so the newest history covers the older ones
+        check.conversation_history = conversation_history
+        if check.on_complete is None:
+            check.on_complete = on_complete
+    else:
+        check = _CompletenessCheck(conversation_history, asyncio.get_running_loop().create_future(), on_complete)
+        _pending_checks[user_id] = check
+        if user_id not in _check_tasks:
+            _check_tasks[user_id] = asyncio.create_task(_drain_completeness_checks(user_id))
+    # Shielded so one caller disconnecting doesn't cancel the result the others are waiting on
+    return await asyncio.shield(check.result)
+
+
+async def _drain_completeness_checks(user_id: str) -> None:
+    """Run queued completeness checks for a user until none are left."""
     try:
-        runner = InMemoryRunner(app_name=APP_NAME, agent=reviewer_agent)
-        session = await runner.session_service.create_session(app_name=APP_NAME, user_id=f"reviewer_{user_id}_{uuid.uuid4().hex[:8]}")
-        user_content = types.Content(role="user", parts=[types.Part(text=conversation_str)])
-
-        full_response = ""
-        async for event in runner.run_async(user_id=session.user_id, session_id=session.session_id, new_message=user_content):
-            if event.is_final_response() and event.content and event.content.parts:
-                full_response = event.content.parts[0].text
-                break
+        while (check := _pending_checks.pop(user_id, None)) is not None:
+            try:
+                result = await _review_conversation(user_id, check.conversation_history)
+                personal_info_data = result.get("personal_info_data") if result.get("is_complete") else None
+                if personal_info_data and check.on_complete is not None:
+                    await check.on_complete(user_id, personal_info_data)
+            except asyncio.CancelledError:
+                check.result.cancel()
+                raise
+            except Exception as e:
+                # Every coalesced caller sees the failure; later queued checks still run
+                check.result.set_exception(e)
+                continue
+            check.result.set_result(result)
+    finally:
+        _check_tasks.pop(user_id, None)
+        # Only reached with a check still queued if this task was cancelled (e.g. at shutdown)
+        leftover = _pending_checks.pop(user_id, None)
+        if leftover is not None:
+            leftover.result.cancel()
+
+
+async def _review_conversation(user_id: str, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Run the reviewer agent over a conversation and parse its verdict."""
+    # A list (not a generator) is what str.join wants; it would build one from a generator anyway
+    conversation_str = "\n".join([(_ROLE_PREFIX.get(msg["role"]) or msg["role"].upper() + ": ") + msg["content"] for msg in conversation_history])
+
+    full_response = ""
+    try:
+        runner = _get_runner(reviewer_agent)
+        async with _ONESHOT_SEM:
+            session = await runner.session_service.create_session(app_name=APP_NAME, user_id=f"reviewer_{user_id}_{uuid.uuid4().hex[:8]}")
+            user_content = types.Content(role="user", parts=[types.Part(text=conversation_str)])
+            try:
+                async for event in runner.run_async(user_id=session.user_id, session_id=session.id, new_message=user_content):
+                    if event.is_final_response() and event.content and event.content.parts:
+                        full_response = event.content.parts[0].text
+                        break
+            finally:
+                await _release_session(runner, session)
 
         cleaned_response = full_response.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response.replace("```json", "").replace("```", "").strip()
+        if cleaned_response.startswith("```"):
+            # Strip only the fence ends instead of rescanning the whole reply for every "```"
+            cleaned_response = cleaned_response.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
 
-        response_data = json.loads(cleaned_response)
+        # orjson parses str input directly; no need to encode first
+        response_data = orjson.loads(cleaned_response)
 
         if response_data.get("is_complete"):
             personal_info_data = {
@@ -140,7 +454,7 @@ async def check_interview_completeness(user_id: str, conversation_history: List[
 
             return {"is_complete": False, "reason": response_data.get("reason", "Unknown"), "suggested_questions": suggested_questions}
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return {"error": "Failed to decode JSON from reviewer agent", "raw_response": full_response}
     except Exception as e:
         return {"error": f"An unexpected error occurred: {e}"}
@@ -148,11 +462,10 @@ async def check_interview_completeness(user_id: str, conversation_history: List[
 
 async def send_followup_questions_to_interviewer(user_id: str, suggested_questions: List[str]):
     """Send follow-up questions to the interviewer agent to continue the conversation."""
-    if user_id not in active_sessions:
+    state = active_sessions.get(user_id)
+    if state is None:
         return
 
-    live_request_queue, message_count, _ = active_sessions[user_id]
-
     questions_text = "\n".join([f"- {q}" for q in suggested_questions])
     guidance_prompt = f"""
 The reviewer has identified that more information is needed. Please ask one of these follow-up questions:
@@ -163,76 +476,86 @@ Choose the most appropriate question and ask it naturally.
 """
 
     guidance_content = Content(role="user", parts=[Part.from_text(text=guidance_prompt)])
-    live_request_queue.send_content(content=guidance_content)
-    active_sessions[user_id] = (live_request_queue, message_count + 1, True)
+    _send_client_content(state, guidance_content)
+    state.message_count += 1
+    state.has_initial_message = True
+    _touch(user_id, state)
+
+
+# Interview run configs and canned prompts never change, so build them once at import
+_INTERVIEW_RUN_CONFIGS = {
+    False: RunConfig(streaming_mode=StreamingMode.SSE, response_modalities=["TEXT"]),
+    True: RunConfig(
+        streaming_mode=StreamingMode.BIDI,
+        response_modalities=["AUDIO"],
+        speech_config=SpeechConfig(voice_config=VoiceConfig(prebuilt_voice_config=PrebuiltVoiceConfig(voice_name="Aoede"))),
+        output_audio_transcription=AudioTranscriptionConfig(),
+        input_audio_transcription=AudioTranscriptionConfig(),
+    ),
+}
+
+_INITIAL_CONTENT = Content(
+    role="user",
+    parts=[Part.from_text(text="Hello! Please introduce yourself and start the interview. The user will be typing their responses, and your responses will be read aloud to them. Please start by asking for their name and preferred pronouns.")],
+)
+_GREETING_TRIGGER_CONTENT = Content(role="user", parts=[Part.from_text(text="Please greet the user and ask for their name and preferred pronouns to start the interview.")])
 
 
 async def get_or_create_session(user_id: str, is_audio: bool = False, force_new: bool = False) -> Tuple[AsyncGenerator, LiveRequestQueue, bool]:
     """Gets existing session or creates new one."""
+    _ensure_session_sweeper()
+
     # Clean up existing session if forcing new or if one exists
     if user_id in active_sessions:
-        old_queue, _, _ = active_sessions[user_id]
-        old_queue.close()
-        del active_sessions[user_id]
-        print(f"🔄 [SESSION] Cleaned up existing session for {user_id}")
+        _close_session_state(active_sessions.pop(user_id))
+        logger.info("[SESSION] Cleaned up existing session for %s", user_id)
 
-    print(f"🔄 [SESSION] Creating new session for {user_id}")
-    runner = InMemoryRunner(app_name=APP_NAME, agent=interviewer_agent)
-    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=user_id)
-    modality = "AUDIO" if is_audio else "TEXT"
+    # Make room by evicting least recently used sessions
+    while len(active_sessions) >= ACTIVE_SESSIONS_MAX:
+        evicted_user_id, evicted = active_sessions.popitem(last=False)
+        _close_session_state(evicted)
+        logger.info("[SESSION] Evicted least recently used session for %s", evicted_user_id)
 
-    speech_config = None
-    if is_audio:
-        speech_config = SpeechConfig(voice_config=VoiceConfig(prebuilt_voice_config=PrebuiltVoiceConfig(voice_name="Aoede")))
-
-    run_config = RunConfig(
-        streaming_mode=StreamingMode.BIDI if is_audio else StreamingMode.SSE,
-        response_modalities=[modality],
-        speech_config=speech_config,
-        output_audio_transcription=AudioTranscriptionConfig() if is_audio else None,
-        input_audio_transcription=AudioTranscriptionConfig() if is_audio else None,
-    )
+    logger.info("[SESSION] Creating new session for %s", user_id)
+    runner = _get_runner(interviewer_agent)
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=user_id)
+    run_config = _INTERVIEW_RUN_CONFIGS[is_audio]
 
-    live_request_queue = LiveRequestQueue()
+    live_request_queue = _TrackedLiveRequestQueue()
     live_events = runner.run_live(
         session=session,
         live_request_queue=live_request_queue,
         run_config=run_config,
     )
-    active_sessions[user_id] = (live_request_queue, 0, False)
-    return live_events, live_request_queue, True
+    active_sessions[user_id] = SessionState(live_request_queue)
+    logger.debug("[SESSION] Active sessions after creation: %d", len(active_sessions))
+    # agent_to_client_sse buffers and batches these itself. The runner is shared, so the
+    # session is dropped from its store once the stream ends (queue closed or client gone).
+    return _release_after(runner, session, live_events), live_request_queue, True
 
 
 async def start_agent_session(user_id: str, is_audio: bool = False) -> Tuple[AsyncGenerator, LiveRequestQueue]:
     """Starts an agent session for a given user."""
-    print(f"🔄 [ADK] TEXT-ONLY MODE - is_audio will be ignored: {is_audio}")
+    logger.debug("[ADK] TEXT-ONLY MODE - is_audio will be ignored: %s", is_audio)
 
-    # Check if we've already sent initial message to this user
-    should_send_initial = user_id not in initial_message_sent
+    # Check if we've already sent initial message to this user (the session is about to be replaced)
+    previous = active_sessions.get(user_id)
+    should_send_initial = previous is None or not previous.has_initial_message
 
     live_events, live_request_queue, is_new = await get_or_create_session(user_id, False, force_new=False)
+    state = active_sessions[user_id]
 
     # Always send initial prompt for new sessions to trigger the agent
     if should_send_initial:
-        initial_prompt = "Hello! Please introduce yourself and start the interview. The user will be typing their responses, and your responses will be read aloud to them. Please start by asking for their name and preferred pronouns."
-        print(f"🚀 [ADK] Sending initial prompt for new TEXT-ONLY interview session for user {user_id}")
-
-        initial_content = Content(role="user", parts=[Part.from_text(text=initial_prompt)])
-        live_request_queue.send_content(content=initial_content)
-
-        # Mark that initial message has been sent to this user
-        initial_message_sent[user_id] = True
-
-        # Update session tracking
-        if user_id in active_sessions:
-            queue, msg_count, _ = active_sessions[user_id]
-            active_sessions[user_id] = (queue, msg_count, True)
+        logger.info("[ADK] Sending initial prompt for new TEXT-ONLY interview session for user %s", user_id)
+        live_request_queue.send_content(content=_INITIAL_CONTENT)
     else:
         # Even if initial message was sent, we need to trigger agent response for new SSE connections
-        print(f"🔄 [ADK] Initial message already sent to user {user_id}, but sending greeting trigger for SSE connection")
-        greeting_trigger = "Please greet the user and ask for their name and preferred pronouns to start the interview."
-        trigger_content = Content(role="user", parts=[Part.from_text(text=greeting_trigger)])
-        live_request_queue.send_content(content=trigger_content)
+        logger.info("[ADK] Initial message already sent to user %s, but sending greeting trigger for SSE connection", user_id)
+        live_request_queue.send_content(content=_GREETING_TRIGGER_CONTENT)
+
+    # Carry the marker over to the new session so the next reconnect only sends the greeting trigger
+    state.has_initial_message = True
 
     return live_events, live_request_queue
 
@@ -242,29 +565,188 @@ async def generate_node_response(prompt: str, agent_type: str = "interviewer_age
     Generates a single response for node creation without maintaining session history.
     Returns the generated text response.
     """
-    live_events, live_request_queue = await create_one_time_session(prompt, agent_type)
+    async with _ONESHOT_SEM:
+        live_events, live_request_queue = await create_one_time_session(prompt, agent_type)
 
-    response_text = ""
+        chunks: List[str] = []
+        append = chunks.append
 
-    try:
-        async for event in live_events:
-            # Extract text from the event
-            part = event.content and event.content.parts and event.content.parts[0]
-            if part and part.text and not event.partial:
-                response_text += part.text
+        try:
+            async for event in live_events:
+                # Extract text from the event
+                content = event.content
+                parts = content.parts if content is not None else None
+                if parts and not event.partial and (text := parts[0].text):
+                    append(text)
+
+                # If the turn is complete, break
+                if event.turn_complete:
+                    break
+
+        except Exception as e:
+            logger.error("Error in node generation: %s", e)
+            raise
+        finally:
+            # Clean up the session
+            live_request_queue.close()
+            await live_events.aclose()
+
+    return "".join(chunks).strip()
+
+
+# Prompt skeletons are compiled once; only the variable slots are filled per call
+_ADK_PROMPT_TMPL = string.Template(
+    """
+        ${context_str}
+        ${life_stage_context}
+        ${user_context}
+        
+        Generate ${num_nodes} thematically distinct and varied life events for ${user_name}. Each event must be unique and explore different facets of life (e.g., career, relationship, personal growth, health). Do not generate multiple events with the same underlying theme. Each event must be:
+        - Directly relevant to ${user_name}'s personal profile above
+        - Written using ${user_name}'s actual name (never use pronouns)
+        - Based on ${user_name}'s specific skills, interests, goals, and background
+        - Realistic for someone in ${user_name}'s situation and location
+        
+        ${time_guidance}
+        ${positivity_guidance}
+        ${node_type_guidance}
+        
+        Additional context from ${user_name}: ${prompt}
+        
+        CRITICAL: Every event description must use "${user_name}" by name and be deeply connected to the personal profile provided. Draw from ${user_name}'s background, current challenges, aspirations, and values to create meaningful, personalized life events.
+        """
+)
 
-            # If the turn is complete, break
-            if event.turn_complete:
-                break
+_IMAGE_PROMPT_TMPL = string.Template(
+    """
+        Create a realistic, professional SQUARE image representing this life event for ${user_name}: ${event_name}
+        
+        Event Context: ${event_description}
+        
+        AGING CONTEXT (${years_elapsed} years have passed):
+        ${aging_guidance}${user_context}
+        
+        Style Requirements:
+        - Photorealistic style with natural lighting
+        - Square aspect ratio (1:1)
+        - Show appropriate facial expressions and body language for this life event
+        - Include relevant environmental elements based on ${user_name}'s background and the event context
+        - Reflect ${user_name}'s profession, interests, and location where appropriate
+        
+        CRITICAL: This image should authentically represent ${user_name}'s life milestone based on their personal profile.
+        Make the image specific to ${user_name}'s background, skills, and current situation. The image should be suitable for a professional life journey visualization.
+        """
+)
+
+
+class _ProfileFields(dict):
+    """Personal info as a template mapping; missing fields render as the profile's placeholder text."""
+
+    _DEFAULTS = {"name": "Unknown", "gender": "Not specified"}
+
+    def __missing__(self, key: str) -> str:
+        return self._DEFAULTS.get(key, "Not provided")
+
+
+# User profile blocks spliced into the node_maker and image prompts
+_EVENT_PROFILE_TMPL = string.Template(
+    """
+            
+            COMPREHENSIVE USER PROFILE (base ALL events heavily on this information):
+            
+            PERSONAL DETAILS:
+            - Full Name: ${name}
+            - Gender: ${gender}
+            - Current Title/Role: ${title}
+            - Location: ${location}
+            
+            BACKGROUND & STORY:
+            - Background: ${background}
+            - Summary: ${summary}
+            - Bio: ${bio}
+            
+            SKILLS & INTERESTS:
+            - Skills: ${skills}
+            - Interests: ${interests}
+            
+            GOALS & VALUES:
+            - Primary Goal: ${goal}
+            - Aspirations: ${aspirations}
+            - Core Values: ${values}
+            
+            CURRENT SITUATION:
+            - Current Challenges: ${challenges}
+            
+            CRITICAL INSTRUCTIONS:
+            1. ALWAYS use "${user_name}" by name in all event descriptions - NEVER use "you", "he", "she", or "they"
+            2. Base events heavily on ${user_name}'s specific background, skills, interests, and goals
+            3. Consider ${user_name}'s current challenges and how they might evolve
+            4. Make events realistic for someone with ${user_name}'s profile and location
+            5. Connect events to ${user_name}'s stated aspirations and values
+            """
+)
+
+_IMAGE_PROFILE_TMPL = string.Template(
+    """
+        
+        COMPREHENSIVE USER CONTEXT FOR IMAGE GENERATION:
+        
+        PERSONAL DETAILS:
+        - Name: ${name} (use this name, not pronouns)
+        - Gender: ${gender}
+        - Current Role: ${title}
+        - Location: ${location}
+        
+        BACKGROUND & CHARACTERISTICS:
+        - Background: ${background}
+        - Summary: ${summary}
+        - Bio: ${bio}
+        
+        INTERESTS & SKILLS:
+        - Skills: ${skills}
+        - Interests: ${interests}
+        
+        VALUES & GOALS:
+        - Core Values: ${values}
+        - Goals: ${aspirations}
+        - Current Challenges: ${challenges}
+        
+        IMPORTANT: Create an image that reflects ${user_name}'s specific background, role, interests, and the context of their life."""
+)
+
+
+_IMAGE_BATCH_PROMPT_TMPL = string.Template(
+    """
+        Generate exactly ${count} separate images, one for each numbered life event below, in the same order.
+        Return the images only, one per event; do not combine events into a single image.
+        ${user_context}
+
+        ${event_prompts}
+        """
+)
 
-    except Exception as e:
-        print(f"Error in node generation: {e}")
-        raise
-    finally:
-        # Clean up the session
-        live_request_queue.close()
 
-    return response_text.strip()
+@functools.lru_cache(maxsize=128)
+def _event_guidance(positivity: int, time_in_months: int, node_type: Optional[str]) -> Tuple[str, str, str]:
+    """Return (positivity, time, node type) guidance lines for the node_maker prompt."""
+    if positivity >= 0:
+        # First bound at or above `positivity`
+        positivity_guidance = _POSITIVITY_TEXTS[bisect.bisect_left(_POSITIVITY_BOUNDS, positivity)]
+    else:
+        positivity_guidance = "Mix positive, neutral, and challenging events."
+    time_guidance = f"All events should occur around {time_in_months} months from now." if time_in_months > 0 else "Events can occur at different timeframes (1-24 months)."
+    node_type_guidance = f"The events should be related to: {node_type}" if node_type else ""
+    return positivity_guidance, time_guidance, node_type_guidance
+
+
+async def _with_limit(sem: asyncio.Semaphore, coro):
+    """Await `coro` while holding `sem`."""
+    async with sem:
+        return await coro
+
+
+# Fields shared by every placeholder event returned when generation fails
+_FALLBACK_EVENT_BASE = {"description": "A significant life event.", "type": "fallback"}
 
 
 async def generate_life_events_with_adk(prior_nodes: List, prompt: str, node_type: str, time_in_months: int, positivity: int, num_nodes: int, user_id: str, highlight_path: List[str] = None, all_links: List[dict] = None) -> List[dict]:
@@ -302,18 +784,7 @@ async def generate_life_events_with_adk(prior_nodes: List, prompt: str, node_typ
         context_str = "\n".join(context_parts) if context_parts else "Starting a new life journey."
 
         # Build prompt details
-        positivity_guidance = ""
-        if positivity >= 0:
-            if positivity <= 30:
-                positivity_guidance = "All events should be challenging."
-            elif positivity <= 70:
-                positivity_guidance = "All events should be neutral or mixed."
-            else:
-                positivity_guidance = "All events should be positive."
-        else:
-            positivity_guidance = "Mix positive, neutral, and challenging events."
-        time_guidance = f"All events should occur around {time_in_months} months from now." if time_in_months > 0 else "Events can occur at different timeframes (1-24 months)."
-        node_type_guidance = f"The events should be related to: {node_type}" if node_type else ""
+        positivity_guidance, time_guidance, node_type_guidance = _event_guidance(positivity, time_in_months, node_type)
 
         # Add aging and life stage context
         life_stage_context = ""
@@ -329,555 +800,817 @@ async def generate_life_events_with_adk(prior_nodes: List, prompt: str, node_typ
             """
 
         # Get personal information to inform event generation
-        print(f"[EVENT_GEN] Getting personal info for user_id: {user_id}")
-        personal_info = get_personal_info(user_id)
+        logger.debug("[EVENT_GEN] Getting personal info for user_id: %s", user_id)
+        personal_info = await aget_personal_info(user_id)
         user_context = ""
         user_name = "the user"
 
         if personal_info:
             user_name = personal_info.get("name", "the user")
             # Build comprehensive user context from all available fields
-            user_context = f"""
-            
-            COMPREHENSIVE USER PROFILE (base ALL events heavily on this information):
-            
-            PERSONAL DETAILS:
-            - Full Name: {personal_info.get("name", "Unknown")}
-            - Gender: {personal_info.get("gender", "Not specified")}
-            - Current Title/Role: {personal_info.get("title", "Not provided")}
-            - Location: {personal_info.get("location", "Not provided")}
-            
-            BACKGROUND & STORY:
-            - Background: {personal_info.get("background", "Not provided")}
-            - Summary: {personal_info.get("summary", "Not provided")}
-            - Bio: {personal_info.get("bio", "Not provided")}
-            
-            SKILLS & INTERESTS:
-            - Skills: {personal_info.get("skills", "Not provided")}
-            - Interests: {personal_info.get("interests", "Not provided")}
-            
-            GOALS & VALUES:
-            - Primary Goal: {personal_info.get("goal", "Not provided")}
-            - Aspirations: {personal_info.get("aspirations", "Not provided")}
-            - Core Values: {personal_info.get("values", "Not provided")}
-            
-            CURRENT SITUATION:
-            - Current Challenges: {personal_info.get("challenges", "Not provided")}
-            
-            CRITICAL INSTRUCTIONS:
-            1. ALWAYS use "{user_name}" by name in all event descriptions - NEVER use "you", "he", "she", or "they"
-            2. Base events heavily on {user_name}'s specific background, skills, interests, and goals
-            3. Consider {user_name}'s current challenges and how they might evolve
-            4. Make events realistic for someone with {user_name}'s profile and location
-            5. Connect events to {user_name}'s stated aspirations and values
-            """
-
-        adk_prompt = f"""
-        {context_str}
-        {life_stage_context}
-        {user_context}
-        
-        Generate {num_nodes} thematically distinct and varied life events for {user_name}. Each event must be unique and explore different facets of life (e.g., career, relationship, personal growth, health). Do not generate multiple events with the same underlying theme. Each event must be:
-        - Directly relevant to {user_name}'s personal profile above
-        - Written using {user_name}'s actual name (never use pronouns)
-        - Based on {user_name}'s specific skills, interests, goals, and background
-        - Realistic for someone in {user_name}'s situation and location
-        
-        {time_guidance}
-        {positivity_guidance}
-        {node_type_guidance}
-        
-        Additional context from {user_name}: {prompt}
-        
-        CRITICAL: Every event description must use "{user_name}" by name and be deeply connected to the personal profile provided. Draw from {user_name}'s background, current challenges, aspirations, and values to create meaningful, personalized life events.
-        """
+            user_context = _EVENT_PROFILE_TMPL.substitute(_ProfileFields(personal_info, user_name=user_name))
+
+        adk_prompt = _ADK_PROMPT_TMPL.substitute(
+            context_str=context_str,
+            life_stage_context=life_stage_context,
+            user_context=user_context,
+            num_nodes=num_nodes,
+            user_name=user_name,
+            time_guidance=time_guidance,
+            positivity_guidance=positivity_guidance,
+            node_type_guidance=node_type_guidance,
+            prompt=prompt,
+        )
 
         # Use the node_maker agent through ADK
         response_text = await generate_node_response(adk_prompt, "node_maker_agent")
 
         try:
-            print(f"[ADK] Raw response from node_maker_agent: {response_text}")
+            logger.debug("[ADK] Raw response from node_maker_agent: %s", response_text)
             start_idx = response_text.find("[")
             end_idx = response_text.rfind("]") + 1
             if start_idx >= 0 and end_idx > start_idx:
                 json_str = response_text[start_idx:end_idx]
-                print(f"[ADK] Extracted JSON: {json_str}")
-                events = json.loads(json_str)
-                print(f"[ADK] Parsed {len(events)} events from AI response")
+                logger.debug("[ADK] Extracted JSON: %s", json_str)
+                events = orjson.loads(json_str)[:num_nodes]
+                logger.info("[ADK] Parsed %d events from AI response", len(events))
                 if len(events) >= num_nodes:
-                    selected_events = events[:num_nodes]
-                    # Generate images for all events in parallel
-                    print(f"Starting PARALLEL image generation for {len(selected_events)} events for user {user_id}")
-
-                    # Create parallel tasks for image generation
-                    image_tasks = []
-                    for event in selected_events:
-                        task = generate_event_image(
-                            user_id=user_id,
-                            event_name=event["name"],
-                            event_description=event["description"],
-                            cumulative_months=cumulative_months,
-                        )
-                        image_tasks.append(task)
-
-                    # Execute all image generation tasks in parallel
-                    print(f"[IMAGE GEN] Running {len(image_tasks)} image generation tasks in parallel...")
-                    image_results = await asyncio.gather(*image_tasks, return_exceptions=True)
-                    for i, (event, result) in enumerate(zip(selected_events, image_results)):
+                    selected_events = events
+                    logger.info("Starting image generation for %d events for user %s", len(selected_events), user_id)
+
+                    image_user_name, image_user_context = build_user_context_for_image(personal_info)
+                    image_results = await generate_event_images_batch(user_id, selected_events, cumulative_months, image_user_name, image_user_context)
+                    for event, result in zip(selected_events, image_results):
                         if isinstance(result, Exception):
-                            print(f"Failed to generate image for {event['name']}: {result}")
+                            logger.warning("Failed to generate image for %s: %s", event["name"], result)
                             event["image_name"] = ""
                             event["image_url"] = ""
                         else:
                             image_filename, signed_url = result
                             event["image_name"] = image_filename
                             event["image_url"] = signed_url
-                            print(f"Image generated for {event['name']}: {image_filename}")
+                            logger.debug("Image generated for %s: %s", event["name"], image_filename)
 
-                    print(f"[IMAGE GEN] Parallel image generation completed for {len(selected_events)} events")
+                    logger.info("[IMAGE GEN] Image generation completed for %d events", len(selected_events))
                     return selected_events
                 else:
-                    print(f"[ADK] Not enough events generated: got {len(events)}, need {num_nodes}")
+                    logger.warning("[ADK] Not enough events generated: got %d, need %d", len(events), num_nodes)
             else:
-                print(f"[ADK] No JSON array found in response")
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"[ADK] JSON parsing failed: {e}")
-            print(f"[ADK] Failed response: {response_text}")
+                logger.warning("[ADK] No JSON array found in response")
+        except (orjson.JSONDecodeError, ValueError) as e:
+            logger.warning("[ADK] JSON parsing failed: %s", e)
+            logger.debug("[ADK] Failed response: %s", response_text)
     except Exception as e:
-        print(f"[ADK] Generation error: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("[ADK] Generation error: %s", e)
 
     # Fallback
-    return [{"name": f"Event {i + 1}", "title": f"Life Event {i + 1}", "description": "A significant life event.", "type": "fallback", "time_months": events_config[i]["time_months"], "positivity_score": events_config[i]["positivity"]} for i in range(num_nodes)]
+    return [{**_FALLBACK_EVENT_BASE, "name": f"Event {i}", "title": f"Life Event {i}", "time_months": config["time_months"], "positivity_score": config["positivity"]} for i, config in enumerate(events_config, 1)]
 
 
 def calculate_cumulative_time(highlight_path: List[str], all_links: List[dict]) -> int:
     """Calculate total months elapsed from start to end of highlight path."""
-    total_months = 0
-
-    # Go through the path and sum up the timeInMonths from each link
-    for i in range(len(highlight_path) - 1):
-        source_node = highlight_path[i + 1]  # Next node in path (links go from later to earlier)
-        target_node = highlight_path[i]  # Current node in path
-
-        # Find the link between these nodes
-        for link in all_links:
-            if link.get("source") == source_node and link.get("target") == target_node:
-                time_months = link.get("timeInMonths", 1)
-                total_months += time_months
-                print(f"[TIME CALC] {source_node} → {target_node}: +{time_months} months (total: {total_months})")
-                break
+    # Index links by (source, target) once; the first link wins, matching the old linear scan
+    link_index: Dict[Tuple[str, str], int] = {}
+    for link in all_links:
+        link_index.setdefault((link.get("source"), link.get("target")), link.get("timeInMonths", 1))
+
+    # Links go from the later node in the path to the earlier one
+    total_months = sum(link_index.get((highlight_path[i + 1], highlight_path[i]), 0) for i in range(len(highlight_path) - 1))
+    logger.debug("[TIME CALC] %d nodes in path: %d months total", len(highlight_path), total_months)
     return total_months
 
 
+# (upper bound in years, guidance) ladders, in ascending order
+_AGING = (
+    (2, "The person should look the same age as in the reference image."),
+    (5, "The person should look slightly older, with subtle signs of maturity."),
+    (10, "The person should look noticeably older, showing clear signs of aging and maturity."),
+    (20, "The person should look significantly older, with visible aging, possible gray hair, and mature features."),
+    (30, "The person should look much older, with considerable aging, gray/white hair, and mature/elderly features."),
+    (float("inf"), "The person should look elderly, with significant aging, white hair, wrinkles, and the wisdom of advanced age."),
+)
+
+_MORTALITY = (
+    (30, ""),  # No special mortality context for younger ages
+    (50, "Consider that significant time has passed. Health and mortality may become relevant considerations."),
+    (float("inf"), "With the substantial time that has passed, consider life's natural progression including potential health challenges, retirement, or end-of-life considerations."),
+)
+
+# (upper bound on positivity, guidance) ladder for event generation
+_POSITIVITY_GUIDANCE = (
+    (30, "All events should be challenging."),
+    (70, "All events should be neutral or mixed."),
+    (float("inf"), "All events should be positive."),
+)
+
+# Split into parallel bounds/texts tuples for bisect
+_AGING_BOUNDS, _AGING_TEXTS = zip(*_AGING)
+_MORTALITY_BOUNDS, _MORTALITY_TEXTS = zip(*_MORTALITY)
+_POSITIVITY_BOUNDS, _POSITIVITY_TEXTS = zip(*_POSITIVITY_GUIDANCE)
+
+
+@functools.lru_cache(maxsize=64)
 def get_aging_context(total_months: int) -> str:
     """Generate aging context based on elapsed time."""
     years = total_months / 12
-
-    if years < 2:
-        return "The person should look the same age as in the reference image."
-    elif years < 5:
-        return "The person should look slightly older, with subtle signs of maturity."
-    elif years < 10:
-        return "The person should look noticeably older, showing clear signs of aging and maturity."
-    elif years < 20:
-        return "The person should look significantly older, with visible aging, possible gray hair, and mature features."
-    elif years < 30:
-        return "The person should look much older, with considerable aging, gray/white hair, and mature/elderly features."
-    else:
-        return "The person should look elderly, with significant aging, white hair, wrinkles, and the wisdom of advanced age."
+    # First bound strictly above `years`
+    return _AGING_TEXTS[bisect.bisect_right(_AGING_BOUNDS, years)]
 
 
+@functools.lru_cache(maxsize=64)
 def get_mortality_context(total_months: int) -> str:
     """Generate mortality context for AI agent based on elapsed time."""
     years = total_months / 12
+    return _MORTALITY_TEXTS[bisect.bisect_right(_MORTALITY_BOUNDS, years)]
 
-    if years < 30:
-        return ""  # No special mortality context for younger ages
-    elif years < 50:
-        return "Consider that significant time has passed. Health and mortality may become relevant considerations."
-    else:
-        return "With the substantial time that has passed, consider life's natural progression including potential health challenges, retirement, or end-of-life considerations."
+
+def _cached_personal_info(user_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Look up a user's personal information in the cache: (hit, info)."""
+    with _personal_info_lock:
+        cached = _personal_info_cache.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            _personal_info_cache.move_to_end(user_id)
+            return True, cached[0]
+    return False, None
 
 
 def get_personal_info(user_id: str) -> Optional[Dict[str, Any]]:
-    """Get personal information for a user from the database."""
+    """Get personal information for a user, served from a short-lived cache when possible."""
+    hit, info = _cached_personal_info(user_id)
+    if hit:
+        return info
+
     if not db:
-        print(f"[PERSONAL_INFO] No database connection available")
+        logger.warning("[PERSONAL_INFO] No database connection available")
         return None
 
     try:
-        with db.cursor(cursor_factory=RealDictCursor) as cursor:
-            # First try to get from personal_information table
+        info = _query_personal_info(user_id)
+    except Exception as e:
+        logger.error("[PERSONAL_INFO] Error getting personal information for user %s: %s", user_id, e)
+        return None
+
+    with _personal_info_lock:
+        _personal_info_cache[user_id] = (info, time.monotonic() + PERSONAL_INFO_CACHE_TTL)
+        _personal_info_cache.move_to_end(user_id)
+        while len(_personal_info_cache) > PERSONAL_INFO_CACHE_MAX:
+            _personal_info_cache.popitem(last=False)
+    return info
+
+
+async def aget_personal_info(user_id: str) -> Optional[Dict[str, Any]]:
+    """Async get_personal_info: cache hits return inline, misses query the database in a worker thread."""
+    hit, info = _cached_personal_info(user_id)
+    if hit:
+        return info
+    return await asyncio.to_thread(get_personal_info, user_id)
+
+
+def invalidate_personal_info(user_id: str) -> None:
+    """Drop a user's cached personal information, e.g. after it is saved."""
+    with _personal_info_lock:
+        _personal_info_cache.pop(user_id, None)
+
+
+def _query_personal_info(user_id: str) -> Optional[Dict[str, Any]]:
+    """Read a user's personal information from the database; errors propagate to the caller."""
+    with db.cursor(cursor_factory=RealDictCursor) as cursor:
+        # First try to get from personal_information table
+        cursor.execute(
+            """
+            SELECT * FROM "stem-connect_personal_information"
+            WHERE "userId" = %s
+            """,
+            (user_id,),
+        )
+        personal_info = cursor.fetchone()
+
+        if personal_info:
+            info_dict = dict(personal_info)
+            logger.debug("[PERSONAL_INFO] Found personal info for user %s: name=%s, fields=%s", user_id, info_dict.get("name", "NOT FOUND"), info_dict.keys())
+            return info_dict
+        else:
+            logger.info("[PERSONAL_INFO] No personal information found for user %s", user_id)
+            # Try to get at least the name from the users table as fallback
             cursor.execute(
                 """
-                SELECT * FROM "stem-connect_personal_information"
-                WHERE "userId" = %s
+                SELECT name FROM "stem-connect_user"
+                WHERE id = %s
                 """,
                 (user_id,),
             )
-            personal_info = cursor.fetchone()
-
-            if personal_info:
-                info_dict = dict(personal_info)
-                print(f"[PERSONAL_INFO] Found personal info for user {user_id}:")
-                print(f"[PERSONAL_INFO] Name: {info_dict.get('name', 'NOT FOUND')}")
-                print(f"[PERSONAL_INFO] UserId: {info_dict.get('userId', 'NOT FOUND')}")
-                print(f"[PERSONAL_INFO] All fields: {list(info_dict.keys())}")
-                return info_dict
-            else:
-                print(f"[PERSONAL_INFO] No personal information found for user {user_id}")
-                # Try to get at least the name from the users table as fallback
-                cursor.execute(
-                    """
-                    SELECT name FROM "stem-connect_user"
-                    WHERE id = %s
-                    """,
-                    (user_id,),
-                )
-                user_record = cursor.fetchone()
-                if user_record:
-                    fallback_info = {"name": user_record["name"]}
-                    print(f"[PERSONAL_INFO] Using fallback name from users table: {fallback_info['name']}")
-                    return fallback_info
-                return None
+            user_record = cursor.fetchone()
+            if user_record:
+                fallback_info = {"name": user_record["name"]}
+                logger.debug("[PERSONAL_INFO] Using fallback name from users table: %s", fallback_info["name"])
+                return fallback_info
+            return None
+
+
+def _get_user_base_image(user_id: str) -> Optional[bytes]:
+    """Get a user's base image from MinIO, memoized per user. Blocking; call via asyncio.to_thread."""
+    with _user_image_lock:
+        if user_id in _user_image_cache:
+            _user_image_cache.move_to_end(user_id)
+            return _user_image_cache[user_id]
+
+    user_image_name = f"{user_id}.png"
+    logger.debug("[IMAGE GEN] Looking for base image: %s/%s", USER_IMAGE_BUCKET, user_image_name)
+    try:
+        response = minio_client.get_object(USER_IMAGE_BUCKET, user_image_name)
+        try:
+            user_image_data = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+        logger.debug("[IMAGE GEN] Retrieved base image for user %s: %d bytes", user_id, len(user_image_data))
+    except S3Error as e:
+        logger.info("[IMAGE GEN] No base image found for user %s: %s", user_id, e)
+        user_image_data = None
 
-    except Exception as e:
-        print(f"[PERSONAL_INFO] Error getting personal information for user {user_id}: {e}")
-        return None
+    with _user_image_lock:
+        _user_image_cache[user_id] = user_image_data
+        while len(_user_image_cache) > USER_IMAGE_CACHE_MAX:
+            _user_image_cache.popitem(last=False)
+    return user_image_data
+
+
+def invalidate_user_image(user_id: str) -> None:
+    """Drop a user's cached base image, e.g. after they upload a new one."""
+    with _user_image_lock:
+        _user_image_cache.pop(user_id, None)
+
+
+def _ensure_bucket(bucket: str) -> None:
+    """Create a MinIO bucket if it is missing. Blocking; call via asyncio.to_thread."""
+    try:
+        if not minio_client.bucket_exists(bucket):
+            minio_client.make_bucket(bucket)
+        _BUCKETS_READY.add(bucket)
+    except S3Error as e:
+        logger.error("Error checking/creating bucket %s: %s", bucket, e)
 
 
-def get_permanent_image_url(bucket_name: str, object_name: str) -> str:
+async def get_permanent_image_url(bucket_name: str, object_name: str) -> str:
     """Generate a permanent signed URL for MinIO object."""
+    key = (bucket_name, object_name)
+    now = time.monotonic()
+    with _signed_url_lock:
+        cached = _signed_url_cache.get(key)
+        if cached and cached[1] > now:
+            _signed_url_cache.move_to_end(key)
+            return cached[0]
+
     try:
         # Generate a presigned URL that expires in 7 days
-        url = minio_client.presigned_get_object(bucket_name=bucket_name, object_name=object_name, expires=timedelta(days=7))
-        print(f"[MINIO] Generated signed URL for {bucket_name}/{object_name}")
-        return url
+        url = await asyncio.to_thread(minio_client.presigned_get_object, bucket_name=bucket_name, object_name=object_name, expires=SIGNED_URL_EXPIRY)
+        logger.debug("[MINIO] Generated signed URL for %s/%s", bucket_name, object_name)
     except S3Error as e:
-        print(f"[MINIO] Error generating signed URL: {e}")
+        logger.error("[MINIO] Error generating signed URL: %s", e)
         return ""
 
+    with _signed_url_lock:
+        _signed_url_cache[key] = (url, now + SIGNED_URL_CACHE_TTL.total_seconds())
+        _signed_url_cache.move_to_end(key)
+        while len(_signed_url_cache) > SIGNED_URL_CACHE_MAX:
+            _signed_url_cache.popitem(last=False)
+    return url
+
+
+def build_user_context_for_image(personal_info: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """Build the (user_name, user_context) prompt fragments for event images."""
+    if not personal_info:
+        return "the person", ""
+
+    user_name = personal_info.get("name", "the person")
+    user_context = _IMAGE_PROFILE_TMPL.substitute(_ProfileFields(personal_info, user_name=user_name))
+    return user_name, user_context
+
+
+async def _ensure_image_buckets() -> None:
+    """Make sure the user and node image buckets exist, off the event loop."""
+    if USER_IMAGE_BUCKET in _BUCKETS_READY and NODE_IMAGE_BUCKET in _BUCKETS_READY:
+        return
+    async with _BUCKET_LOCK:
+        for bucket in (USER_IMAGE_BUCKET, NODE_IMAGE_BUCKET):
+            if bucket not in _BUCKETS_READY:
+                await asyncio.to_thread(_ensure_bucket, bucket)
+
+
+def _event_image_prompt(event_name: str, event_description: str, cumulative_months: int, user_name: str, user_context: str) -> str:
+    """Fill the image prompt template for one event."""
+    return _IMAGE_PROMPT_TMPL.substitute(
+        user_name=user_name,
+        event_name=event_name,
+        event_description=event_description,
+        years_elapsed=f"{cumulative_months / 12:.1f}",
+        aging_guidance=get_aging_context(cumulative_months),
+        user_context=user_context,
+    )
+
+
+def _image_contents(user_image_data: Optional[bytes], prompt: str) -> List[types.Content]:
+    """Build the Gemini request contents: the user's base image (if any) followed by the prompt."""
+    parts = []
+    if user_image_data:
+        logger.debug("[IMAGE GEN] Adding user base image as context")
+        parts.append(types.Part.from_bytes(mime_type="image/png", data=user_image_data))
+    else:
+        logger.debug("[IMAGE GEN] No base image, generating without user context")
+    parts.append(types.Part.from_text(text=prompt))
+    return [types.Content(role="user", parts=parts)]
+
+
+async def _generate_images(contents: List[types.Content], label: str, limit: int = 1) -> list:
+    """Stream a Nano Banana generation and collect up to `limit` inline images, in order, holding a Gemini in-flight slot."""
+    images = []
+    chunk_count = 0
+    # Checked once per stream rather than per chunk
+    debug = logger.isEnabledFor(logging.DEBUG)
+    async with _GEMINI_SEM:
+        # The async client streams on the event loop, so concurrent generations don't each pin a thread
+        stream = await _GENAI_CLIENT.aio.models.generate_content_stream(
+            model=IMAGE_MODEL,
+            contents=contents,
+            config=_IMAGE_GEN_CONFIG,
+        )
+        # aclosing() closes the stream on the early return below, cancelling the upstream response
+        # instead of leaving the model generating tokens until the generator is collected
+        async with contextlib.aclosing(stream):
+            async for chunk in stream:
+                chunk_count += 1
+                if debug:
+                    logger.debug("[IMAGE GEN] Received chunk %d", chunk_count)
+
+                # Walk candidates -> content -> parts once; metadata-only chunks drop out here
+                candidates = chunk.candidates
+                content = candidates[0].content if candidates else None
+                parts = content.parts if content is not None else None
+                if not parts:
+                    if debug:
+                        logger.debug("[IMAGE GEN] Chunk %d has no content, skipping", chunk_count)
+                    continue
+
+                for part in parts:
+                    inline_data = part.inline_data
+                    if inline_data and inline_data.data:
+                        if debug:
+                            logger.debug("[IMAGE GEN] Found image data in chunk %d!", chunk_count)
+                        images.append(inline_data)
+                        if len(images) == limit:
+                            return images
+                    elif debug and part.text:
+                        logger.debug("[IMAGE GEN] Text response: %s", part.text)
+
+    if not images:
+        logger.warning("[IMAGE GEN] No image data received for %s after %d chunks", label, chunk_count)
+    return images
+
+
+async def _store_event_image(user_id: str, event_name: str, inline_data) -> tuple[str, str]:
+    """Upload a generated event image to MinIO and return (filename, signed URL)."""
+    data_buffer = bytes(inline_data.data)  # no-op for bytes, pins the zero-copy BytesIO path
+    file_extension = _MIME_EXT.get(inline_data.mime_type, ".png")
+    logger.debug("[IMAGE GEN] Image data: %d bytes, type: %s", len(data_buffer), inline_data.mime_type)
+
+    # Create filename: {node-name}-{user-id}.png
+    safe_event_name = event_name.translate(_NAME_TRANS).lower()
+    image_filename = f"{safe_event_name}-{user_id}{file_extension}"
+    logger.debug("[IMAGE GEN] Target filename: %s", image_filename)
 
-async def generate_event_image(user_id: str, event_name: str, event_description: str, cumulative_months: int = 0) -> tuple[str, str]:
-    """Generate an image for a life event using user's base image as context with Nano Banana."""
-    print(f"[IMAGE GEN] Starting image generation for event: {event_name}, user: {user_id}")
     try:
-        # Ensure buckets exist
-        user_bucket = "user-images"
-        node_bucket = "node-images"
+        # BytesIO shares an immutable bytes buffer until written to, so this wraps the
+        # image without copying it (a memoryview or bytearray would be copied instead)
+        data_stream = io.BytesIO(data_buffer)
+        await asyncio.to_thread(minio_client.put_object, NODE_IMAGE_BUCKET, image_filename, data_stream, length=len(data_buffer), content_type=inline_data.mime_type)
+        logger.info("[IMAGE GEN] Image uploaded to MinIO: %s/%s", NODE_IMAGE_BUCKET, image_filename)
+
+        # Generate permanent signed URL
+        signed_url = await get_permanent_image_url(NODE_IMAGE_BUCKET, image_filename)
+        return image_filename, signed_url
+    except S3Error as e:
+        logger.error("[IMAGE GEN] Error uploading image to MinIO: %s", e)
+        return "", ""
 
-        for bucket in [user_bucket, node_bucket]:
-            try:
-                if not minio_client.bucket_exists(bucket):
-                    minio_client.make_bucket(bucket)
-            except S3Error as e:
-                print(f"Error checking/creating bucket {bucket}: {e}")
 
-        # Get user's base image from MinIO
-        user_image_name = f"{user_id}.png"
-        user_image_data = None
+# In-flight event image generations keyed by (user_id, sanitized event name); both would write the same object
+_image_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
 
-        print(f"[IMAGE GEN] Looking for base image: {user_bucket}/{user_image_name}")
+async def generate_event_image(user_id: str, event_name: str, event_description: str, cumulative_months: int = 0, user_name: str = "the person", user_context: Optional[str] = None) -> tuple[str, str]:
+    """Generate an image for a life event, sharing the result with concurrent calls for the same event."""
+    key = (user_id, event_name.translate(_NAME_TRANS).lower())
+    pending = _image_inflight.get(key)
+    if pending is not None:
+        logger.info("[IMAGE GEN] Joining in-flight generation for event: %s, user: %s", event_name, user_id)
         try:
-            response = minio_client.get_object(user_bucket, user_image_name)
-            user_image_data = response.read()
-            print(f"[IMAGE GEN] Retrieved base image for user {user_id}: {len(user_image_data)} bytes")
-        except S3Error as e:
-            print(f"[IMAGE GEN] No base image found for user {user_id}: {e}")
-            print(f"[IMAGE GEN] Will generate image without base image context")
-
-        # Get aging context based on cumulative time
-        aging_guidance = get_aging_context(cumulative_months)
-        years_elapsed = cumulative_months / 12
-
-        # Get personal information to inform image generation
-        print(f"[IMAGE_GEN] Getting personal info for user_id: {user_id}")
-        personal_info = get_personal_info(user_id)
-        user_context = ""
-        user_name = "the person"
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # Only our own cancellation propagates; a cancelled leader just means no image
+            if not pending.cancelled():
+                raise
+            return "", ""
 
-        if personal_info:
-            user_name = personal_info.get("name", "the person")
-            user_context = f"""
-        
-        COMPREHENSIVE USER CONTEXT FOR IMAGE GENERATION:
-        
-        PERSONAL DETAILS:
-        - Name: {personal_info.get("name", "Unknown")} (use this name, not pronouns)
-        - Gender: {personal_info.get("gender", "Not specified")}
-        - Current Role: {personal_info.get("title", "Not provided")}
-        - Location: {personal_info.get("location", "Not provided")}
-        
-        BACKGROUND & CHARACTERISTICS:
-        - Background: {personal_info.get("background", "Not provided")}
-        - Summary: {personal_info.get("summary", "Not provided")}
-        - Bio: {personal_info.get("bio", "Not provided")}
-        
-        INTERESTS & SKILLS:
-        - Skills: {personal_info.get("skills", "Not provided")}
-        - Interests: {personal_info.get("interests", "Not provided")}
-        
-        VALUES & GOALS:
-        - Core Values: {personal_info.get("values", "Not provided")}
-        - Goals: {personal_info.get("aspirations", "Not provided")}
-        - Current Challenges: {personal_info.get("challenges", "Not provided")}
-        
-        IMPORTANT: Create an image that reflects {user_name}'s specific background, role, interests, and the context of their life."""
+    future = asyncio.get_running_loop().create_future()
+    _image_inflight[key] = future
+    try:
+        result = await _generate_event_image(user_id, event_name, event_description, cumulative_months, user_name, user_context)
+        future.set_result(result)
+        return result
+    finally:
+        if not future.done():
+            future.cancel()
+        if _image_inflight.get(key) is future:
+            del _image_inflight[key]
+
+
+async def _generate_event_image(user_id: str, event_name: str, event_description: str, cumulative_months: int, user_name: str, user_context: Optional[str]) -> tuple[str, str]:
+    """Generate an image for a life event using user's base image as context with Nano Banana."""
+    logger.info("[IMAGE GEN] Starting image generation for event: %s, user: %s", event_name, user_id)
+    try:
+        await _ensure_image_buckets()
+
+        # Get user's base image from MinIO (shared across this user's parallel events)
+        user_image_data = await asyncio.to_thread(_get_user_base_image, user_id)
+        if user_image_data is None:
+            logger.debug("[IMAGE GEN] Will generate image without base image context")
+
+        # The profile block is the same for every event, so batch callers build it once and pass it in
+        if user_context is None:
+            logger.debug("[IMAGE_GEN] Getting personal info for user_id: %s", user_id)
+            user_name, user_context = build_user_context_for_image(await aget_personal_info(user_id))
+
+        if not GEMINI_API_KEY:
+            logger.warning("[IMAGE GEN] No GEMINI_API_KEY found, skipping image generation")
+            return "", ""
 
         # Create image prompt based on event with aging context and comprehensive user info
-        image_prompt = f"""
-        Create a realistic, professional SQUARE image representing this life event for {user_name}: {event_name}
-        
-        Event Context: {event_description}
-        
-        AGING CONTEXT ({years_elapsed:.1f} years have passed):
-        {aging_guidance}{user_context}
-        
-        Style Requirements:
-        - Photorealistic style with natural lighting
-        - Square aspect ratio (1:1)
-        - Show appropriate facial expressions and body language for this life event
-        - Include relevant environmental elements based on {user_name}'s background and the event context
-        - Reflect {user_name}'s profession, interests, and location where appropriate
-        
-        CRITICAL: This image should authentically represent {user_name}'s life milestone based on their personal profile.
-        Make the image specific to {user_name}'s background, skills, and current situation. The image should be suitable for a professional life journey visualization.
-        """
+        image_prompt = _event_image_prompt(event_name, event_description, cumulative_months, user_name, user_context)
+        logger.debug("[IMAGE GEN] Prompt: %.100s...", image_prompt)
+        logger.debug("[IMAGE GEN] Starting Nano Banana generation for %s...", event_name)
 
-        if GEMINI_API_KEY:
-            print(f"[IMAGE GEN] GEMINI_API_KEY found, proceeding with image generation")
-
-            # Initialize Google GenAI client for image generation
-            client = google_genai.Client(api_key=GEMINI_API_KEY)
-
-            model = "gemini-2.5-flash-image-preview"
-            print(f"[IMAGE GEN] Using model: {model}")
-
-            # Create content with user image as context + text prompt (if base image exists)
-            parts = []
-            if user_image_data:
-                print(f"[IMAGE GEN] Adding user base image as context")
-                parts.append(
-                    types.Part.from_bytes(
-                        mime_type="image/png",
-                        data=user_image_data,
-                    )
-                )
-            else:
-                print(f"[IMAGE GEN] No base image, generating without user context")
+        images = await _generate_images(_image_contents(user_image_data, image_prompt), event_name)
+        if not images:
+            logger.warning("[IMAGE GEN] No image data received from Nano Banana for %s", event_name)
+            return "", ""
+        return await _store_event_image(user_id, event_name, images[0])
 
-            parts.append(types.Part.from_text(text=image_prompt))
+    except Exception as e:
+        logger.exception("[IMAGE GEN] Error generating image for event %s: %s", event_name, e)
+        return "", ""
 
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=parts,
-                ),
-            ]
-
-            print(f"[IMAGE GEN] Prompt: {image_prompt[:100]}...")
-            generate_content_config = types.GenerateContentConfig(
-                response_modalities=[
-                    "IMAGE",
-                    "TEXT",
-                ],
-            )
 
-            print(f"[IMAGE GEN] Starting Nano Banana generation for {event_name}...")
-
-            # Generate image using Nano Banana (run in executor for true async)
-            def _generate_image_sync():
-                chunk_count = 0
-                for chunk in client.models.generate_content_stream(
-                    model=model,
-                    contents=contents,
-                    config=generate_content_config,
-                ):
-                    chunk_count += 1
-                    print(f"[IMAGE GEN] Received chunk {chunk_count}")
-
-                    if chunk.candidates is None or chunk.candidates[0].content is None or chunk.candidates[0].content.parts is None:
-                        print(f"[IMAGE GEN] Chunk {chunk_count} has no content, skipping")
-                        continue
-
-                    # Check for image data
-                    part = chunk.candidates[0].content.parts[0]
-                    if part.inline_data and part.inline_data.data:
-                        print(f"[IMAGE GEN] Found image data in chunk {chunk_count}!")
-                        return part.inline_data
-                    else:
-                        # Handle text response (if any)
-                        if hasattr(chunk, "text") and chunk.text:
-                            print(f"[IMAGE GEN] Text response: {chunk.text}")
-                        else:
-                            print(f"[IMAGE GEN] Chunk {chunk_count} has no image or text data")
+async def generate_event_images_batch(user_id: str, events: List[Dict[str, Any]], cumulative_months: int = 0, user_name: str = "the person", user_context: str = "") -> list:
+    """
+    Generate one image per event, by default with one generate_event_image call per event.
 
-                print(f"[IMAGE GEN] No image data received for {event_name} after {chunk_count} chunks")
-                return None
+    With IMAGE_BATCH_GENERATION enabled, all of them are requested from Nano Banana in a single
+    call that sends the base image and user context once; if the model errors or returns a different
+    number of images than events, every event falls back to its own generate_event_image call.
+    Returns one (filename, signed URL) tuple or exception per event, in order.
+    """
+    if IMAGE_BATCH_GENERATION and GEMINI_API_KEY and len(events) > 1:
+        try:
+            await _ensure_image_buckets()
+            user_image_data = await asyncio.to_thread(_get_user_base_image, user_id)
+            event_prompts = "\n".join(
+                f"IMAGE {i}:{_event_image_prompt(event['name'], event['description'], cumulative_months, user_name, '')}" for i, event in enumerate(events, 1)
+            )
+            batch_prompt = _IMAGE_BATCH_PROMPT_TMPL.substitute(count=len(events), user_context=user_context, event_prompts=event_prompts)
+            images = await _generate_images(_image_contents(user_image_data, batch_prompt), f"{len(events)} events", limit=len(events))
+            if len(images) == len(events):
+                logger.info("[IMAGE GEN] Batch generated %d images for user %s in one request", len(images), user_id)
+                return await asyncio.gather(*(_store_event_image(user_id, event["name"], image) for event, image in zip(events, images)), return_exceptions=True)
+            logger.warning("[IMAGE GEN] Batch returned %d images for %d events; generating per event", len(images), len(events))
+        except Exception as e:
+            logger.warning("[IMAGE GEN] Batch generation failed, generating per event: %s", e)
+
+    # Per-event path (the default, and the batch fallback), at most IMAGE_CONCURRENCY at a time
+    image_sem = asyncio.Semaphore(IMAGE_CONCURRENCY)
+    logger.debug("[IMAGE GEN] Running %d image generation tasks, %d at a time...", len(events), IMAGE_CONCURRENCY)
+    return await asyncio.gather(
+        *(
+            _with_limit(
+                image_sem,
+                generate_event_image(
+                    user_id=user_id,
+                    event_name=event["name"],
+                    event_description=event["description"],
+                    cumulative_months=cumulative_months,
+                    user_name=user_name,
+                    user_context=user_context,
+                ),
+            )
+            for event in events
+        ),
+        return_exceptions=True,
+    )
 
-            # Run the synchronous generation in a thread pool
-            import concurrent.futures
 
-            loop = asyncio.get_event_loop()
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                inline_data = await loop.run_in_executor(executor, _generate_image_sync)
+# Every (turn_complete, interrupted) status frame, built once; ADK leaves either flag as None when unset
+_STATUS_FRAMES = {(tc, itr): _SSE_PREFIX + orjson.dumps({"turn_complete": tc, "interrupted": itr}) + _SSE_SUFFIX for tc in (True, False, None) for itr in (True, False, None)}
 
-            if inline_data:
-                data_buffer = inline_data.data
-                file_extension = mimetypes.guess_extension(inline_data.mime_type) or ".png"
-                print(f"[IMAGE GEN] Image data: {len(data_buffer)} bytes, type: {inline_data.mime_type}")
+# The completeness nudge never varies either
+_COMPLETENESS_FRAME = _SSE_PREFIX + orjson.dumps({"completeness_suggested": True}) + _SSE_SUFFIX
 
-                # Create filename: {node-name}-{user-id}.png
-                safe_event_name = event_name.replace(" ", "-").replace("/", "-").lower()
-                image_filename = f"{safe_event_name}-{user_id}{file_extension}"
-                print(f"[IMAGE GEN] Target filename: {image_filename}")
 
-                # Upload to MinIO
-                try:
-                    data_stream = io.BytesIO(data_buffer)
-                    minio_client.put_object(node_bucket, image_filename, data_stream, length=len(data_buffer), content_type=inline_data.mime_type)
-                    print(f"[IMAGE GEN] Image uploaded to MinIO: {node_bucket}/{image_filename}")
+# Fixed-shape audio frame: {"mime_type": "audio/pcm", "data": <base64>, "sample_rate": 24000}
+_AUDIO_FRAME_PREFIX = _SSE_PREFIX + b'{"mime_type":"audio/pcm","data":"'
+_AUDIO_FRAME_SUFFIX = b'","sample_rate":24000}' + _SSE_SUFFIX
 
-                    # Generate permanent signed URL
-                    signed_url = get_permanent_image_url(node_bucket, image_filename)
-                    return image_filename, signed_url
-                except S3Error as e:
-                    print(f"[IMAGE GEN] Error uploading image to MinIO: {e}")
-                    return "", ""
-            else:
-                print(f"[IMAGE GEN] No image data received from Nano Banana for {event_name}")
-                return "", ""
-        else:
-            if not GEMINI_API_KEY:
-                print("[IMAGE GEN] No GEMINI_API_KEY found, skipping image generation")
-            else:
-                print("[IMAGE GEN] No user image data and GEMINI_API_KEY found")
-            return "", ""
 
-    except Exception as e:
-        print(f"[IMAGE GEN] Error generating image for event {event_name}: {e}")
-        import traceback
+def _sse_frame(message: Dict[str, Any]) -> bytes:
+    """Encode a message as a single SSE data frame."""
+    return _SSE_PREFIX + orjson.dumps(message) + _SSE_SUFFIX
 
-        traceback.print_exc()
-        return "", ""
 
+# Agent audio is 24 kHz mono 16-bit PCM: 48 bytes per millisecond. Consecutive audio parts within a
+# batch are merged into one frame until at least AUDIO_COALESCE_MS of sound has accumulated.
+_BYTES_PER_MS_24K = 48
+AUDIO_COALESCE_MS = int(os.getenv("AUDIO_COALESCE_MS", "20"))
+_AUDIO_COALESCE_BYTES = AUDIO_COALESCE_MS * _BYTES_PER_MS_24K
 
-async def summarize_path_history(history: list[str]) -> str:
-    """Uses the summarizer agent to condense a list of historical events."""
-    if not history:
-        return ""
 
-    prompt = "Please summarize the following life events into a short paragraph:\\n\\n" + "\\n".join(history)
-    summary = await generate_node_response(prompt, agent_name="summarizer_agent")
-    return summary
+def _audio_frame(pcm: bytes) -> bytes:
+    """Encode PCM audio as a single SSE frame."""
+    # Base64 output never needs JSON escaping, so splice the encoded bytes straight into the frame
+    return b"".join((_AUDIO_FRAME_PREFIX, pybase64.b64encode(pcm), _AUDIO_FRAME_SUFFIX))
 
 
-async def agent_to_client_sse(live_events: AsyncGenerator) -> AsyncGenerator[str, None]:
-    """Yields Server-Sent Events from the agent's live events."""
-    completion_trigger = "[COMPLETION_SUGGESTED]"
-    print(f"[SSE DEBUG] Starting SSE stream processing")
-    async for event in live_events:
-        print(f"[SSE DEBUG] Processing event: turn_complete={getattr(event, 'turn_complete', None)}, interrupted={getattr(event, 'interrupted', None)}, has_content={bool(event.content)}")
-        if event.turn_complete or event.interrupted:
-            message = {"turn_complete": event.turn_complete, "interrupted": event.interrupted}
-            yield f"data: {json.dumps(message)}\n\n"
-            continue
+def _audio_payload(event) -> Optional[bytes]:
+    """Return the PCM bytes of a plain audio event, or None for any other event."""
+    if event.turn_complete or event.interrupted:
+        return None
+    content = event.content
+    parts = content.parts if content is not None else None
+    if not parts:
+        return None
+    inline_data = parts[0].inline_data
+    if inline_data and inline_data.data and inline_data.mime_type.startswith("audio/pcm"):
+        return inline_data.data
+    return None
+
+
+@dataclass(slots=True)
+class PersonalInfo:
+    """Profile collected by the interviewer's check_interview_completeness call."""
+
+    name: str
+    gender: str
+    summary: str
+    background: str
+    aspirations: str
+    values: str
+    challenges: str
+    bio: str
+    goal: str
+    location: str
+    interests: str
+    skills: str
+    title: str
+
+    @classmethod
+    def from_args(cls, args: Dict[str, Any]) -> "PersonalInfo":
+        """Build the profile from the tool call arguments, reading each argument once."""
+        title = args.get("user_title", "Not provided")
+        location = args.get("user_location", "Not provided")
+        background = args.get("background_info", "Not provided")
+        aspirations = args.get("aspirations_info", "Not provided")
+        values = args.get("values_info", "Not provided")
+        challenges = args.get("challenges_info", "Not provided")
+        skills = args.get("user_skills", "Not provided")
+
+        summary = (
+            f"A {args.get('user_title', 'person')} based in {args.get('user_location', 'an unknown location')}. "
+            f"Background: {background}. "
+            f"Aspirations: {aspirations}. "
+            f"Values: {values}. "
+            f"Challenges: {challenges}."
+        ).strip()
+
+        return cls(
+            name=args.get("user_name", "Unknown"),
+            gender=args.get("user_gender", "Not specified"),
+            summary=summary,
+            background=background,
+            aspirations=aspirations,
+            values=values,
+            challenges=challenges,
+            bio=summary,
+            goal=aspirations,
+            location=location,
+            interests=skills,
+            skills=skills,
+            title=title,
+        )
+
+
+_COMPLETION_TRIGGER = "[COMPLETION_SUGGESTED]"
+
+
+def _text_frame(text: str) -> bytes:
+    """Encode a streamed text delta as a single SSE frame."""
+    return _sse_frame({"mime_type": "text/plain", "data": text})
+
+
+def _text_delta(event) -> Optional[str]:
+    """Return the text of a plain partial text event, or None for any event that needs _event_frames."""
+    if not event.partial or event.turn_complete or event.interrupted:
+        return None
+    content = event.content
+    parts = content.parts if content is not None else None
+    # A lone part rules out function calls riding along with the text
+    if not parts or len(parts) != 1:
+        return None
+    part = parts[0]
+    text = part.text
+    if not text or part.inline_data is not None or _COMPLETION_TRIGGER in text:
+        return None
+    return text
+
+
+def _event_frames(event) -> Iterator[bytes]:
+    """Yields the SSE frames for a single live event."""
+    completion_trigger = _COMPLETION_TRIGGER
+    # Checked once per event so production (INFO) never builds the debug arguments
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("[SSE DEBUG] Processing event: turn_complete=%s, interrupted=%s, has_content=%s", event.turn_complete, event.interrupted, event.content is not None)
+    if event.turn_complete or event.interrupted:
+        yield _STATUS_FRAMES[(event.turn_complete, event.interrupted)]
+        return
 
-        part: Part = event.content and event.content.parts and event.content.parts[0]
-        if not part:
-            continue
+    content = event.content
+    parts = content.parts if content is not None else None
+    if not parts:
+        return
+    part: Part = parts[0]
 
-        is_audio = part.inline_data and part.inline_data.mime_type.startswith("audio/pcm")
+    is_audio = part.inline_data and part.inline_data.mime_type.startswith("audio/pcm")
+    if is_audio:
+        audio_data = part.inline_data.data if part.inline_data else None
+        if audio_data:
+            yield _audio_frame(audio_data)
+            return
+
+    if part.text:
+        cleaned_text = part.text
+        completeness_suggested = False
+        if debug:
+            logger.debug("[SSE DEBUG] Found text: '%.50s...' (length: %d) partial=%s", cleaned_text, len(cleaned_text), event.partial)
+
+        if completion_trigger in cleaned_text:
+            cleaned_text = cleaned_text.replace(completion_trigger, "").strip()
+            completeness_suggested = True
+
+        # Only send text if it's a partial event (streaming chunk)
+        if cleaned_text and event.partial:
+            yield _text_frame(cleaned_text)
+            if debug:
+                logger.debug("[AGENT TO CLIENT]: text/plain (partial): %d chars", len(cleaned_text))
+
+        if completeness_suggested:
+            yield _COMPLETENESS_FRAME
+            if debug:
+                logger.debug("[AGENT TO CLIENT]: completeness_suggested")
+
+    function_calls = event.get_function_calls() if hasattr(event, "get_function_calls") else []
+    if function_calls:
+        for call in function_calls:
+            if call.name == "check_interview_completeness":
+                personal_info_data = PersonalInfo.from_args(call.args)
+                yield _sse_frame({"interview_complete": True, "personal_info_data": personal_info_data})
+
+
+async def agent_to_client_sse(live_events: AsyncGenerator) -> AsyncGenerator[bytes, None]:
+    """
+    Yields Server-Sent Events from the agent's live events, one write per batch of ready events.
+    Consecutive text deltas within a batch are merged into a single text frame.
+    """
+    logger.debug("[SSE DEBUG] Starting SSE stream processing")
+    async for batch in buffered_batches(live_events, buffer_size=SSE_EVENT_BUFFER, max_batch=SSE_MAX_BATCH):
+        frames: List[bytes] = []
+        pending_audio: List[bytes] = []
+        pending_bytes = 0
+        pending_text: List[str] = []
+        for event in batch:
+            pcm = _audio_payload(event)
+            text = _text_delta(event) if pcm is None else None
+            if pending_text and text is None:
+                frames.append(_text_frame("".join(pending_text)))
+                pending_text.clear()
+            if pcm is not None:
+                pending_audio.append(pcm)
+                pending_bytes += len(pcm)
+                if pending_bytes < _AUDIO_COALESCE_BYTES:
+                    continue
+            if pending_audio:
+                frames.append(_audio_frame(b"".join(pending_audio)))
+                pending_audio.clear()
+                pending_bytes = 0
+            if text is not None:
+                pending_text.append(text)
+            elif pcm is None:
+                frames.extend(_event_frames(event))
+        # Audio and text are never held back across batches
+        if pending_audio:
+            frames.append(_audio_frame(b"".join(pending_audio)))
+        if pending_text:
+            frames.append(_text_frame("".join(pending_text)))
+
+        if len(frames) == 1:
+            yield frames[0]
+        elif frames:
+            yield b"".join(frames)
+
+
+# Client audio is 16 kHz mono 16-bit PCM: 32 bytes per millisecond
+_BYTES_PER_MS_16K = 32
+# Matches the frontend's minimum recording length
+MIN_AUDIO_DURATION_MS = int(os.getenv("MIN_AUDIO_DURATION_MS", "800"))
+_MIN_AUDIO_BYTES = MIN_AUDIO_DURATION_MS * _BYTES_PER_MS_16K
+
+# Client audio chunks a session buffers while ADK is not taking them; past this the oldest is dropped
+AUDIO_SEND_BACKLOG = int(os.getenv("AUDIO_SEND_BACKLOG", "64"))
+
+
+async def _forward_client_messages(state: SessionState) -> None:
+    """Hand a session's buffered client messages to ADK one at a time, only as fast as ADK takes them."""
+    live_request_queue = state.queue
+    outbox = state.outbox
+    while True:
+        while not outbox:
+            state.outbox_ready.clear()
+            await state.outbox_ready.wait()
+        is_audio, payload = outbox.popleft()
         if is_audio:
-            audio_data = part.inline_data.data if part.inline_data else None
-            if audio_data:
-                sample_count = len(audio_data) // 2
-                message = {
-                    "mime_type": "audio/pcm",
-                    "data": base64.b64encode(audio_data).decode("ascii"),
-                    "sample_rate": 24000,
-                }
-                yield f"data: {json.dumps(message)}\n\n"
-                continue
+            state.outbox_audio -= 1
+            live_request_queue.send_realtime(payload)
+        else:
+            live_request_queue.send_content(content=payload)
+        # While ADK is stalled, new audio piles up in the bounded outbox instead of the unbounded live queue
+        await live_request_queue.wait_drained()
 
-        if part.text:
-            cleaned_text = part.text
-            completeness_suggested = False
-            print(f"[SSE DEBUG] Found text: '{cleaned_text[:50]}...' (length: {len(cleaned_text)}) partial={getattr(event, 'partial', None)}")
-
-            if completion_trigger in cleaned_text:
-                cleaned_text = cleaned_text.replace(completion_trigger, "").strip()
-                completeness_suggested = True
-
-            # Only send text if it's a partial event (streaming chunk)
-            if cleaned_text and event.partial:
-                message = {"mime_type": "text/plain", "data": cleaned_text}
-                yield f"data: {json.dumps(message)}\n\n"
-                print(f"[AGENT TO CLIENT]: text/plain (partial): {message}")
-
-            if completeness_suggested:
-                yield f"data: {json.dumps({'completeness_suggested': True})}\n\n"
-                print(f"[AGENT TO CLIENT]: completeness_suggested")
-
-        function_calls = event.get_function_calls() if hasattr(event, "get_function_calls") else []
-        if function_calls:
-            for call in function_calls:
-                if call.name == "check_interview_completeness":
-                    args = call.args
-
-                    summary_text = (
-                        f"A {args.get('user_title', 'person')} based in {args.get('user_location', 'an unknown location')}. "
-                        f"Background: {args.get('background_info', 'Not provided')}. "
-                        f"Aspirations: {args.get('aspirations_info', 'Not provided')}. "
-                        f"Values: {args.get('values_info', 'Not provided')}. "
-                        f"Challenges: {args.get('challenges_info', 'Not provided')}."
-                    ).strip()
-
-                    personal_info_data = {
-                        "name": args.get("user_name", "Unknown"),
-                        "gender": args.get("user_gender", "Not specified"),
-                        "summary": summary_text,
-                        "background": args.get("background_info", "Not provided"),
-                        "aspirations": args.get("aspirations_info", "Not provided"),
-                        "values": args.get("values_info", "Not provided"),
-                        "challenges": args.get("challenges_info", "Not provided"),
-                        "bio": summary_text,
-                        "goal": args.get("aspirations_info", "Not provided"),
-                        "location": args.get("user_location", "Not provided"),
-                        "interests": args.get("user_skills", "Not provided"),
-                        "skills": args.get("user_skills", "Not provided"),
-                        "title": args.get("user_title", "Not provided"),
-                    }
-
-                    yield f"data: {json.dumps({'interview_complete': True, 'personal_info_data': personal_info_data})}\n\n"
+
+def _send_client_content(state: SessionState, content: Content) -> None:
+    """Send text to the agent, queued behind any client audio that is still buffered."""
+    if state.outbox:
+        state.outbox.append((False, content))
+        state.outbox_ready.set()
+    else:
+        state.queue.send_content(content=content)
+
+
+def _buffer_client_audio(user_id: str, state: SessionState, blob: Blob) -> bool:
+    """Queue a client audio chunk for the session's forwarder; returns True if an older chunk was dropped for it."""
+    outbox = state.outbox
+    dropped = state.outbox_audio >= AUDIO_SEND_BACKLOG
+    if dropped:
+        # Drop the oldest audio so the stream catches up; buffered text is never dropped.
+        # Text only queues behind audio, so the oldest audio is nearly always at the front
+        if outbox[0][0]:
+            outbox.popleft()
+        else:
+            outbox.remove(next(entry for entry in outbox if entry[0]))
+        logger.warning("[AUDIO] Agent for %s is not taking audio, dropped the oldest buffered chunk", user_id)
+    else:
+        state.outbox_audio += 1
+    outbox.append((True, blob))
+    state.outbox_ready.set()
+    if state.forwarder is None:
+        state.forwarder = asyncio.create_task(_forward_client_messages(state))
+    return dropped
 
 
 def send_message_to_agent(user_id: str, mime_type: str, data: str) -> Dict[str, Any]:
     """Sends a message from the client to the agent."""
-    session_data = active_sessions.get(user_id)
-    if not session_data:
+    state = active_sessions.get(user_id)
+    if state is None:
         raise ValueError(f"Session not found for user {user_id}.")
 
-    live_request_queue, message_count, has_initial = session_data
-
     if mime_type == "text/plain":
-        content = Content(role="user", parts=[Part.from_text(text=data)])
-        live_request_queue.send_content(content=content)
-        message_count += 1
+        # Fields are known-good here, so skip pydantic validation on the per-message path
+        _send_client_content(state, Content.model_construct(role="user", parts=[Part.model_construct(text=data)]))
+        counted = True
     elif mime_type == "audio/pcm":
-        decoded_data = base64.b64decode(data)
-        live_request_queue.send_realtime(Blob(data=decoded_data, mime_type=mime_type))
-        message_count += 1
+        decoded_data = pybase64.b64decode(data, validate=False)
+        # Integer byte threshold, so the common (long enough) case never computes a duration
+        if len(decoded_data) < _MIN_AUDIO_BYTES and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[AUDIO] Input audio too short (%dms < %dms); cut-off speech may confuse the agent", len(decoded_data) // _BYTES_PER_MS_16K, MIN_AUDIO_DURATION_MS)
+        # When an older chunk is dropped for this one, the count stays put: the dropped chunk never reaches the agent
+        counted = not _buffer_client_audio(user_id, state, Blob.model_construct(data=decoded_data, mime_type=mime_type))
     else:
         raise ValueError(f"Mime type not supported: {mime_type}")
 
-    active_sessions[user_id] = (live_request_queue, message_count, has_initial)
+    if counted:
+        state.message_count += 1
+    _touch(user_id, state)
+    message_count = state.message_count
 
     return {
         "message_count": message_count,
-        "should_check_completeness": message_count >= 8 and message_count % 2 == 0,
+        "should_check_completeness": message_count >= 8 and not message_count & 1,
     }
@@ -0,0 +1,12 @@
+"""
+Helpers Module.
+
+This module contains small async utilities shared by the ADK integration.
+"""
+
+from .buffered_generator import buffered, buffered_batches
+
+__all__ = [
+    "buffered",
+    "buffered_batches",
+]
@@ -0,0 +1,91 @@
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, List, TypeVar
+
+T = TypeVar("T")
+
+# Marks the end of the wrapped iterator in the buffer queue
+_DONE = object()
+
+
+class _ProducerError:
+    """Carries an exception raised by the producer across the buffer queue."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _start_producer(agen: AsyncIterator[T], queue: asyncio.Queue) -> asyncio.Task:
+    """Drain `agen` into `queue` on a background task, ending with _DONE or a _ProducerError."""
+
+    async def _produce():
+        try:
+            async for item in agen:
+                await queue.put(item)
+            await queue.put(_DONE)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(_ProducerError(e))
+
+    return asyncio.create_task(_produce())
+
+
+async def buffered(agen: AsyncIterator[T], buffer_size: int = 16) -> AsyncGenerator[T, None]:
+    """
+    Decouple an async iterator from its consumer with a bounded queue.
+
+    A background task drains `agen` into an asyncio.Queue so the producer can run up to
+    `buffer_size` items ahead of the consumer. Producer exceptions are re-raised to the
+    consumer, and the producer task is cancelled once the consumer stops iterating.
+    While the buffer is backed up the consumer yields to the event loop between items,
+    so a bursty stream cannot starve other sessions.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    producer = _start_producer(agen, queue)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+            # A non-empty queue means the next get() won't suspend; give other tasks a turn
+            if not queue.empty():
+                await asyncio.sleep(0)
+    finally:
+        producer.cancel()
+
+
+async def buffered_batches(agen: AsyncIterator[T], buffer_size: int = 256, max_batch: int = 32) -> AsyncGenerator[List[T], None]:
+    """
+    Like `buffered`, but yield every item that is already waiting as one list.
+
+    Each batch holds at least one item and at most `max_batch`; the consumer only suspends
+    when the buffer is empty, so a burst from the producer is handed over in a single step.
+    Items that arrived before the producer finished or failed are delivered first.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    producer = _start_producer(agen, queue)
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            terminal = batch[-1]
+            if terminal is _DONE or isinstance(terminal, _ProducerError):
+                batch.pop()
+                if batch:
+                    yield batch
+                if terminal is _DONE:
+                    return
+                raise terminal.error
+
+            yield batch
+            if not queue.empty():
+                await asyncio.sleep(0)
+    finally:
+        producer.cancel()
@@ -1,5 +1,4 @@
 from google.adk.agents import LlmAgent
-import json
 from typing import Dict, Any
 
 # Function tool for the interviewer to check completeness
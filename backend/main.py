@@ -1,6 +1,6 @@
 import asyncio
 import io
-import json
+import logging
 import os
 import random
 import string
@@ -10,12 +10,13 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 import adk
+import orjson
 import psycopg2
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from models import AddNodeRequest, AddPersonalInformationRequest, Link, Node, NodeRequest, NodeResponse, UpdatePersonalInformationRequest
 from models.requests import AddNodeRequest, AddPersonalInformationRequest, InterviewCompletenessRequest, UpdateNodeRequest, UpdatePersonalInformationRequest
@@ -37,6 +38,16 @@ adk.set_database_connection(db)
 
 # ADK will handle AI configuration internally
 
+
+@app.on_event("shutdown")
+async def close_adk_clients():
+    """Close pooled connections held by ADK's shared clients."""
+    await adk.close_genai_client()
+
+
+# Child of the "adk" logger, so agent endpoint logs share its level and off-thread handler
+logger = logging.getLogger("adk.api")
+
 # /**
 #  * APP INFORMATION
 #  */
@@ -116,24 +127,23 @@ security = HTTPBearer()
 @app.get("/adk/events/{user_id}")
 async def adk_events_endpoint(user_id: str, is_audio: str = "false"):
     """SSE endpoint for agent-to-client communication."""
-    print(f"🚨 [ENDPOINT DEBUG] /adk/events/{user_id} called with is_audio={is_audio}")
+    logger.debug("[ENDPOINT DEBUG] /adk/events/%s called with is_audio=%s", user_id, is_audio)
     live_events, live_request_queue = await adk.start_agent_session(user_id, is_audio == "true")
 
     def cleanup():
         live_request_queue.close()
-        if user_id in adk.active_sessions:
-            del adk.active_sessions[user_id]
-        print(f"Client #{user_id} disconnected from SSE, active sessions: {list(adk.active_sessions.keys())}")
+        adk.close_session(user_id)
+        logger.info("[SSE] Client #%s disconnected, active sessions: %d", user_id, len(adk.active_sessions))
 
     async def event_generator():
         try:
             async for data in adk.agent_to_client_sse(live_events):
                 yield data
         except Exception as e:
-            print(f"Error in SSE stream: {e}")
+            logger.error("[SSE] Error in SSE stream: %s", e)
         finally:
             # Don't cleanup immediately - let the session persist for bidirectional communication
-            print(f"SSE stream ended for {user_id}, session will remain active for message sending")
+            logger.debug("[SSE] Stream ended for %s, session will remain active for message sending", user_id)
             # Note: Session cleanup will happen when user switches modes or refreshes
 
     return StreamingResponse(
@@ -147,11 +157,12 @@ async def adk_events_endpoint(user_id: str, is_audio: str = "false"):
     )
 
 
-@app.post("/adk/send/{user_id}")
+@app.post("/adk/send/{user_id}", response_class=ORJSONResponse)
 async def adk_send_message_endpoint(user_id: str, request: Request):
     """HTTP endpoint for client-to-agent communication with audio support."""
     try:
-        message = await request.json()
+        # Called for every recorded audio chunk; orjson parses the raw body (base64 audio included) in one pass
+        message = orjson.loads(await request.body())
         mime_type = message["mime_type"]
         data = message["data"]
 
@@ -168,96 +179,120 @@ async def adk_send_message_endpoint(user_id: str, request: Request):
 @app.get("/adk/session-status/{user_id}")
 async def get_session_status(user_id: str):
     """Check if a session exists for a user (for debugging)."""
-    return {"user_id": user_id, "session_exists": user_id in adk.active_sessions, "initial_message_sent": user_id in adk.initial_message_sent, "active_sessions": list(adk.active_sessions.keys()), "initial_messages_sent": list(adk.initial_message_sent.keys()), "total_sessions": len(adk.active_sessions)}
+    state = adk.active_sessions.get(user_id)
+    initial_messages_sent = [uid for uid, session in adk.active_sessions.items() if session.has_initial_message]
+    return {"user_id": user_id, "session_exists": state is not None, "initial_message_sent": bool(state and state.has_initial_message), "active_sessions": list(adk.active_sessions.keys()), "initial_messages_sent": initial_messages_sent, "total_sessions": len(adk.active_sessions)}
 
 
 @app.delete("/adk/session/{user_id}")
 async def cleanup_session(user_id: str):
     """Manually cleanup a session."""
     try:
-        if user_id in adk.active_sessions:
-            live_request_queue, _, _ = adk.active_sessions[user_id]
-            live_request_queue.close()
-            del adk.active_sessions[user_id]
-
-        # Also clear initial message tracking
-        if user_id in adk.initial_message_sent:
-            del adk.initial_message_sent[user_id]
+        adk.close_session(user_id)
 
-        return {"message": f"Session {user_id} cleaned up", "active_sessions": list(adk.active_sessions.keys()), "initial_messages_sent": list(adk.initial_message_sent.keys())}
+        return {"message": f"Session {user_id} cleaned up", "active_sessions": list(adk.active_sessions.keys()), "initial_messages_sent": [uid for uid, session in adk.active_sessions.items() if session.has_initial_message]}
     except Exception as e:
         return {"error": f"Failed to cleanup session: {str(e)}"}
 
 
+# Reviewed saves run in a worker thread (often from the background completeness check), so they use their own
+# connection rather than `db`, whose commits and rollbacks belong to the request handlers on the loop thread.
+# They run one at a time: the connection isn't shared across threads, and concurrent SELECT-then-INSERT upserts
+# could both insert a row
+_reviewed_save_lock = asyncio.Lock()
+_reviewed_save_db = None
+
+
+def _reviewed_save_connection():
+    """Return the connection reserved for reviewed saves, reopening it if it was closed. Hold _reviewed_save_lock."""
+    global _reviewed_save_db
+    if _reviewed_save_db is None or _reviewed_save_db.closed:
+        _reviewed_save_db = psycopg2.connect(DATABASE_URL)
+    return _reviewed_save_db
+
+
+def _save_reviewed_personal_info(user_id: str, personal_info_data: dict):
+    """Upsert the personal information extracted by the reviewer. Blocking; call via asyncio.to_thread."""
+    conn = _reviewed_save_connection()
+    try:
+        with conn.cursor() as cursor:
+            # First, check if a record already exists for this user
+            cursor.execute(
+                """
+                SELECT id FROM "stem-connect_personal_information"
+                WHERE "userId" = %s
+                """,
+                (user_id,),
+            )
+            existing_record = cursor.fetchone()
+
+            if existing_record:
+                # If it exists, UPDATE it
+                cursor.execute(
+                    """
+                    UPDATE "stem-connect_personal_information"
+                    SET bio = %(bio)s,
+                        goal = %(goal)s,
+                        location = %(location)s,
+                        interests = %(interests)s,
+                        skills = %(skills)s,
+                        title = %(title)s,
+                        summary = %(summary)s,
+                        background = %(background)s,
+                        aspirations = %(aspirations)s,
+                        "values" = %(values)s,
+                        challenges = %(challenges)s
+                    WHERE "userId" = %(user_id)s
+                    """,
+                    {**personal_info_data, "user_id": user_id},
+                )
+                logger.info("[DB] Updated personal information for user %s", user_id)
+            else:
+                # If it doesn't exist, INSERT a new record
+                # Get user's name from the user table to satisfy NOT NULL constraint
+                cursor.execute('SELECT name FROM "stem-connect_user" WHERE id = %s', (user_id,))
+                user_record = cursor.fetchone()
+                user_name = user_record[0] if user_record else "New User"
+
+                new_id = str(uuid.uuid4())
+
+                cursor.execute(
+                    """
+                    INSERT INTO "stem-connect_personal_information"
+                    (id, "userId", name, bio, goal, location, interests, skills, title, summary, background, aspirations, "values", challenges)
+                    VALUES (%(id)s, %(user_id)s, %(name)s, %(bio)s, %(goal)s, %(location)s, %(interests)s, %(skills)s, %(title)s, %(summary)s, %(background)s, %(aspirations)s, %(values)s, %(challenges)s)
+                    """,
+                    {"id": new_id, "user_id": user_id, "name": user_name, **personal_info_data},
+                )
+                logger.info("[DB] Created personal information for user %s", user_id)
+            conn.commit()
+            adk.invalidate_personal_info(user_id)
+    except Exception as e:
+        conn.rollback()
+        # Raised inside the completeness check's drain task, so no HTTPException here; the endpoint maps it
+        raise RuntimeError(f"Failed to save personal information: {e}") from e
+
+
+async def _persist_reviewed_personal_info(user_id: str, personal_info_data: dict):
+    """Save a completed review's personal information."""
+    # Keep the blocking upsert off the event loop so live interview streams keep flowing
+    async with _reviewed_save_lock:
+        await asyncio.to_thread(_save_reviewed_personal_info, user_id, personal_info_data)
+
+
 @app.post("/adk/check-completeness")
 async def check_interview_completeness_endpoint(request: InterviewCompletenessRequest):
     """
     Endpoint to check for interview completeness and upsert personal information.
     """
-    print(f"[COMPLETENESS] Received request for user: {request.user_id}")
-    print(f"[COMPLETENESS] Conversation history length: {len(request.conversation_history)}")
-    print(f"[COMPLETENESS] Sample conversation: {request.conversation_history[:2] if request.conversation_history else 'Empty'}")
-
-    result = await adk.check_interview_completeness(request.user_id, request.conversation_history)
-    if result.get("is_complete"):
-        personal_info_data = result.get("personal_info_data")
-        if personal_info_data:
-            try:
-                with db.cursor() as cursor:
-                    # First, check if a record already exists for this user
-                    cursor.execute(
-                        """
-                        SELECT id FROM "stem-connect_personal_information"
-                        WHERE "userId" = %s
-                        """,
-                        (request.user_id,),
-                    )
-                    existing_record = cursor.fetchone()
+    logger.info("[COMPLETENESS] Received request for user: %s, history length: %d", request.user_id, len(request.conversation_history))
+    logger.debug("[COMPLETENESS] Sample conversation: %s", request.conversation_history[:2] or "Empty")
 
-                    if existing_record:
-                        # If it exists, UPDATE it
-                        cursor.execute(
-                            """
-                            UPDATE "stem-connect_personal_information"
-                            SET bio = %(bio)s,
-                                goal = %(goal)s,
-                                location = %(location)s,
-                                interests = %(interests)s,
-                                skills = %(skills)s,
-                                title = %(title)s,
-                                summary = %(summary)s,
-                                background = %(background)s,
-                                aspirations = %(aspirations)s,
-                                "values" = %(values)s,
-                                challenges = %(challenges)s
-                            WHERE "userId" = %(user_id)s
-                            """,
-                            {**personal_info_data, "user_id": request.user_id},
-                        )
-                        print(f"[DB] Updated personal information for user {request.user_id}")
-                    else:
-                        # If it doesn't exist, INSERT a new record
-                        # Get user's name from the user table to satisfy NOT NULL constraint
-                        cursor.execute('SELECT name FROM "stem-connect_user" WHERE id = %s', (request.user_id,))
-                        user_record = cursor.fetchone()
-                        user_name = user_record[0] if user_record else "New User"
-
-                        new_id = str(uuid.uuid4())
-
-                        cursor.execute(
-                            """
-                            INSERT INTO "stem-connect_personal_information"
-                            (id, "userId", name, bio, goal, location, interests, skills, title, summary, background, aspirations, "values", challenges)
-                            VALUES (%(id)s, %(user_id)s, %(name)s, %(bio)s, %(goal)s, %(location)s, %(interests)s, %(skills)s, %(title)s, %(summary)s, %(background)s, %(aspirations)s, %(values)s, %(challenges)s)
-                            """,
-                            {"id": new_id, "user_id": request.user_id, "name": user_name, **personal_info_data},
-                        )
-                        print(f"[DB] Created personal information for user {request.user_id}")
-                    db.commit()
-            except Exception as e:
-                db.rollback()
-                raise HTTPException(status_code=500, detail=f"Failed to save personal information: {e}")
-    return result
+    # Checks coalesced into one reviewer run share its result, and the save runs once for that run
+    try:
+        return await adk.check_interview_completeness(request.user_id, request.conversation_history, on_complete=_persist_reviewed_personal_info)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/get-personal-info/{user_id}")
@@ -352,6 +387,7 @@ async def save_personal_info_endpoint(request: dict):
                 )
                 print(f"[DB] Created personal information for user {user_id}")
             db.commit()
+            adk.invalidate_personal_info(user_id)
 
         return {"message": "Personal information saved successfully"}
 
@@ -662,7 +698,7 @@ async def delete_node(user_id: str, node_id: str):
                 print(f"Deleting {len(node_images_to_delete)} images from MinIO")
                 for image_name in node_images_to_delete:
                     try:
-                        adk.minio_client.remove_object("node-images", image_name)
+                        await asyncio.to_thread(adk.minio_client.remove_object, "node-images", image_name)
                         deleted_images.append(image_name)
                         print(f"Deleted image: {image_name}")
                     except Exception as e:
@@ -682,10 +718,10 @@ async def check_user_image_exists(user_id: str):
     try:
         print(f"Checking user image for: {user_id}")
 
-        # Check if user-images bucket exists
+        # Check if user-images bucket exists; MinIO calls are blocking HTTP, so they run off the event loop
         bucket_name = "user-images"
         try:
-            bucket_exists = adk.minio_client.bucket_exists(bucket_name)
+            bucket_exists = await asyncio.to_thread(adk.minio_client.bucket_exists, bucket_name)
             print(f"Bucket '{bucket_name}' exists: {bucket_exists}")
         except Exception as e:
             print(f"Error checking bucket: {e}")
@@ -699,7 +735,7 @@ async def check_user_image_exists(user_id: str):
         print(f"Looking for image: {user_image_name}")
 
         try:
-            stat = adk.minio_client.stat_object(bucket_name, user_image_name)
+            stat = await asyncio.to_thread(adk.minio_client.stat_object, bucket_name, user_image_name)
             print(f"Found image: {user_image_name}, size: {stat.size}")
             return {"exists": True, "image_name": user_image_name}
         except Exception as e:
@@ -729,9 +765,9 @@ async def upload_user_image(user_id: str, request: Request):
         # Ensure user-images bucket exists
         bucket_name = "user-images"
         try:
-            if not adk.minio_client.bucket_exists(bucket_name):
+            if not await asyncio.to_thread(adk.minio_client.bucket_exists, bucket_name):
                 print(f"Creating bucket: {bucket_name}")
-                adk.minio_client.make_bucket(bucket_name)
+                await asyncio.to_thread(adk.minio_client.make_bucket, bucket_name)
                 print(f"Bucket created: {bucket_name}")
             else:
                 print(f"Bucket exists: {bucket_name}")
@@ -747,14 +783,15 @@ async def upload_user_image(user_id: str, request: Request):
 
             # Check if image already exists and remove it first to ensure overwrite
             try:
-                adk.minio_client.stat_object(bucket_name, user_image_name)
+                await asyncio.to_thread(adk.minio_client.stat_object, bucket_name, user_image_name)
                 print(f"Removing existing image: {user_image_name}")
-                adk.minio_client.remove_object(bucket_name, user_image_name)
+                await asyncio.to_thread(adk.minio_client.remove_object, bucket_name, user_image_name)
             except:
                 print(f"No existing image to remove: {user_image_name}")
 
             data_stream = io.BytesIO(file_data)
-            adk.minio_client.put_object(bucket_name, user_image_name, data_stream, length=len(file_data), content_type="image/png")
+            await asyncio.to_thread(adk.minio_client.put_object, bucket_name, user_image_name, data_stream, length=len(file_data), content_type="image/png")
+            adk.invalidate_user_image(user_id)
 
             print(f"User image uploaded: {bucket_name}/{user_image_name}")
             return {"success": True, "message": f"Image uploaded successfully as {user_image_name}", "image_name": user_image_name}